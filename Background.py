@@ -0,0 +1,258 @@
+"""
+Background builds for expensive features.
+
+A feature with its Background property set hands a full build to
+submit() instead of running it inside execute. The build runs in its own
+process, so it can be stopped at any time: a newer submit() for the same
+object terminates the one in flight. The result comes back as a BREP string
+and is applied on the main thread by the callback, polled with a QTimer.
+Progress is shown in the status bar.
+
+The job process is not a daemon, so the build can start its own workers.
+Cancelling a job stops its workers with it, and jobs still running when
+their document is closed or FreeCAD exits are cancelled. What the build
+prints (e.g. that it fell back to a serial build) is shown as a warning
+with the result.
+
+Only used with the GUI up; without an event loop nothing would pick the
+results up, and callers build synchronously instead.
+
+The features use the helpers at the end: their proxies keep the parameters
+of the build in flight in `pending`, and may have a rebase(params, shape)
+method taking the result as the start of their incremental updates.
+"""
+import FreeCAD
+import Part
+import atexit, importlib, multiprocessing, os, signal, subprocess, sys, tempfile, time
+
+import WorkerPool
+import ShapeCache
+import LazyShape
+import Recompute
+
+_jobs = {}
+_timer = None
+
+def preferences():
+    return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Mark/Background")
+
+def available():
+    return FreeCAD.GuiUp and WorkerPool.interpreter() is not None
+
+def run(connection, paths, module, function, args):
+    # Runs in the job process, which leads its own process group so that
+    # cancel() can stop the workers too
+    if hasattr(os, "setsid"):
+        os.setsid()
+    WorkerPool.initworker(paths)
+    with tempfile.TemporaryFile() as log:
+        # The console output of the build, sent back with the result
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        try:
+            shape = getattr(importlib.import_module(module), function)(*args)
+            result = (True, shape.exportBrepToString())
+        except Exception as e:
+            result = (False, "{0}: {1}".format(type(e).__name__, e))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        log.seek(0)
+        output = log.read().decode(errors="replace")
+    try:
+        connection.send(result + (output,))
+    finally:
+        connection.close()
+
+
+class Job:
+    def __init__(self, obj, module, function, args, done):
+        self.document = obj.Document.Name
+        self.name = obj.Name
+        self.label = obj.Label
+        self.done = done
+        self.started = time.perf_counter()
+
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(WorkerPool.interpreter())
+        self.connection, child = context.Pipe(duplex=False)
+        self.process = context.Process(target=run, args=(child, list(sys.path), module, function, args))
+        self.process.start()
+        child.close()
+
+    def object(self):
+        # The document or the object may be gone by the time the result is in
+        doc = FreeCAD.listDocuments().get(self.document)
+        return doc.getObject(self.name) if doc else None
+
+    def cancel(self):
+        # Stops the process and the workers it started
+        if self.process.is_alive():
+            pid = self.process.pid
+            if hasattr(os, "killpg"):
+                try:
+                    os.killpg(pid, signal.SIGTERM)
+                except OSError:
+                    self.process.terminate()
+            else:
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1)
+        self.connection.close()
+
+    def result(self):
+        # (ok, brep or error, output) once the process is done, else None
+        try:
+            if self.connection.poll():
+                return self.connection.recv()
+        except (EOFError, OSError):
+            return (False, "build process stopped (exit code {0})".format(self.process.exitcode), "")
+        if not self.process.is_alive():
+            return (False, "build process stopped (exit code {0})".format(self.process.exitcode), "")
+        return None
+
+
+def key(obj):
+    return (obj.Document.Name, obj.Name)
+
+def submit(obj, module, function, args, done):
+    """Build module.function(*args) in the background for obj
+
+    done(obj, shape) is called on the main thread with the result, unless
+    the job was cancelled or obj was deleted in the meantime.
+    """
+    cancel(obj)
+    _jobs[key(obj)] = Job(obj, module, function, args, done)
+    schedule()
+    status()
+
+def cancel(obj):
+    job = _jobs.pop(key(obj), None)
+    if job is not None:
+        job.cancel()
+        status()
+
+def running(obj):
+    return key(obj) in _jobs
+
+@atexit.register
+def cancelall():
+    # Registered after multiprocessing, so it runs before that joins the jobs
+    while _jobs:
+        _jobs.popitem()[1].cancel()
+
+def schedule():
+    global _timer
+    from PySide import QtCore
+
+    if _timer is None:
+        _timer = QtCore.QTimer()
+        _timer.timeout.connect(poll)
+    if not _timer.isActive():
+        _timer.start(preferences().GetInt("PollInterval", 100))
+
+def poll():
+    for k, job in list(_jobs.items()):
+        obj = job.object()
+        if obj is None:
+            # Deleted, or its document was closed
+            del _jobs[k]
+            job.cancel()
+            continue
+        result = job.result()
+        if result is None:
+            continue
+        del _jobs[k]
+        job.cancel()
+
+        ok, data, output = result
+        seconds = time.perf_counter() - job.started
+        if output.strip():
+            FreeCAD.Console.PrintWarning("Background build of {0}: {1}\n".format(job.label, output.strip()))
+        if not ok:
+            FreeCAD.Console.PrintError("Background build of {0} failed: {1}\n".format(job.label, data))
+        else:
+            shape = Part.Shape()
+            shape.importBrepFromString(data)
+            FreeCAD.Console.PrintMessage("Background build of {0} done in {1:.1f} s\n".format(job.label, seconds))
+            job.done(obj, shape)
+
+    if not _jobs and _timer is not None:
+        _timer.stop()
+    status()
+
+def status():
+    if not FreeCAD.GuiUp:
+        return
+    import FreeCADGui
+
+    bar = FreeCADGui.getMainWindow().statusBar()
+    if not _jobs:
+        bar.clearMessage()
+        return
+    now = time.perf_counter()
+    jobs = ", ".join("{0} ({1:.0f} s)".format(job.label, now - job.started) for job in _jobs.values())
+    bar.showMessage("Building in the background: {0}".format(jobs))
+
+
+def addproperties(obj):
+    # Properties of the features building in the background, also added
+    # to old documents
+    if not hasattr(obj, "Background"):
+        obj.addProperty("App::PropertyBool",
+                        "Background",
+                        "Performance",
+                        "Run full builds in a background process, keeping the GUI responsive").Background = False
+    if not hasattr(obj, "LastUpdate"):
+        obj.addProperty("App::PropertyString",
+                        "LastUpdate",
+                        "Debug",
+                        "How the shape was produced in the last recompute")
+        obj.setEditorMode("LastUpdate", 1)
+
+def busy(obj, params):
+    "True while the background build of params runs for obj; builds of other parameters are cancelled"
+    proxy = obj.Proxy
+    if proxy.pending is not None:
+        if proxy.pending == params and running(obj):
+            return True
+        cancel(obj)
+        proxy.pending = None
+    return False
+
+def start(obj, params, module, args):
+    """Build module.buildshape(*args) for params in the background
+
+    Returns False when obj does not build in the background, or cannot.
+    """
+    if not (obj.Background and available()):
+        return False
+    obj.Proxy.pending = params
+    submit(obj, module, "buildshape", args, finish)
+    return True
+
+def finish(obj, shape):
+    # Result of a build started by start(), on the main thread
+    proxy = obj.Proxy
+    params, proxy.pending = proxy.pending, None
+    ShapeCache.cache().put(ShapeCache.shapekey(proxy.Type, params), shape)
+    if hasattr(proxy, "rebase"):
+        proxy.rebase(params, shape)
+    # Outside a recompute, so the placement has to be kept
+    LazyShape.assign(obj, shape)
+    obj.LastUpdate = "background"
+    for dependent in obj.InList:
+        dependent.touch()
+    if obj.InList:
+        Recompute.request(obj)
+
+def viewchanged(vp, prop):
+    "Shared by the view providers of the features"
+    if prop == "Visibility" and vp.Visibility:
+        # Saved without its shape and shown for the first time
+        LazyShape.ensureshape(vp.Object)
+    Recompute.request(vp.Object, delay=Recompute.defaultdelay())
@@ -0,0 +1,87 @@
+"""
+B-rep shapes from indexed meshes with shared topology.
+
+Every vertex and every edge is created once and used by all faces around
+it, so the faces of a closed mesh come out connected and the shell needs no
+sewing. A face is a list of vertex loops: the outer loop counter-clockwise
+seen from outside, followed by the holes running clockwise. Triangles can be
+passed as an m x 3 array, which avoids building a loop per triangle.
+"""
+import FreeCAD
+import Part
+import numpy as np
+
+
+def sides(triangles, loops):
+    # Start and end vertex of every side, triangles first
+    triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+    start = [triangles.ravel()] + [np.asarray(l, dtype=np.intp) for l in loops]
+    end = [triangles[:, [1, 2, 0]].ravel()] + [np.roll(l, -1) for l in start[1:]]
+    return np.concatenate(start), np.concatenate(end)
+
+def sideedges(start, end, count):
+    # Unique edges as (low, high), and for every side the index of its edge
+    # and whether it runs against it
+    low, high = np.minimum(start, end), np.maximum(start, end)
+    keys, index = np.unique(low*count + high, return_inverse=True)
+    return np.stack([keys // count, keys % count], axis=1), index, start > end
+
+
+class Topology:
+    "Vertices and edges built once, handed out to the faces using them"
+
+    def __init__(self, vertices, edges):
+        self.vertices = [Part.Vertex(FreeCAD.Vector(*p)) for p in np.asarray(vertices, dtype=float).tolist()]
+        self.edges = [Part.Edge(self.vertices[a], self.vertices[b]) for a, b in edges.tolist()]
+        self.reversededges = [None]*len(self.edges)
+
+    def edge(self, index, reverse):
+        if not reverse:
+            return self.edges[index]
+        # Same underlying edge, opposite orientation
+        edge = self.reversededges[index]
+        if edge is None:
+            edge = self.reversededges[index] = self.edges[index].reversed()
+        return edge
+
+    def wire(self, indices, reverse):
+        return Part.Wire([self.edge(i, r) for i, r in zip(indices, reverse)])
+
+
+def faces(vertices, triangles=(), polygons=()):
+    "Faces of a mesh with shared vertices and edges, triangles first"
+    loops = [loop for face in polygons for loop in face]
+    start, end = sides(triangles, loops)
+    edges, index, reverse = sideedges(start, end, len(vertices))
+    topology = Topology(vertices, edges)
+
+    index, reverse = index.tolist(), reverse.tolist()
+    i = len(start) - sum(len(l) for l in loops)
+    facelist = [Part.Face(topology.wire(index[t:t+3], reverse[t:t+3]))
+                for t in range(0, i, 3)]
+
+    for face in polygons:
+        wires = []
+        for loop in face:
+            wires.append(topology.wire(index[i:i+len(loop)], reverse[i:i+len(loop)]))
+            i += len(loop)
+        face = Part.Face(wires[0])
+        if len(wires) > 1:
+            face.cutHoles(wires[1:])
+        facelist.append(face)
+    return facelist
+
+def submesh(vertices, triangles=(), polygons=()):
+    "Part of a mesh, renumbered to the vertices it uses"
+    triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+    loops = [np.asarray(loop, dtype=np.intp) for face in polygons for loop in face]
+    used = np.unique(np.concatenate([triangles.ravel()] + loops))
+    return (np.asarray(vertices)[used], np.searchsorted(used, triangles),
+            [[np.searchsorted(used, loop) for loop in face] for face in polygons])
+
+def shell(vertices, triangles=(), polygons=()):
+    return Part.Shell(faces(vertices, triangles, polygons))
+
+def solid(vertices, triangles=(), polygons=()):
+    "Closed mesh as a solid, without sewing"
+    return Part.Solid(shell(vertices, triangles, polygons))
@@ -0,0 +1,239 @@
+"""
+3D convex hull of a point set (quickhull), in NumPy.
+
+Every face keeps the points outside it, and a new point only looks at the
+faces around the one it was taken from, so a step does not scan the whole
+hull or point set. The hull triangles are oriented outward; coplanar
+triangles are merged into convex polygons afterwards.
+Does not need FreeCAD.
+"""
+import heapq
+import numpy as np
+
+
+def cross(u, v):
+    # np.cross, without its overhead on the small arrays of every step
+    return np.stack([u[:, 1]*v[:, 2] - u[:, 2]*v[:, 1],
+                     u[:, 2]*v[:, 0] - u[:, 0]*v[:, 2],
+                     u[:, 0]*v[:, 1] - u[:, 1]*v[:, 0]], axis=1)
+
+def planes(points, triangles):
+    a, b, c = (points[triangles[:, i]] for i in range(3))
+    normals = cross(b - a, c - a)
+    normals /= np.sqrt((normals**2).sum(axis=1))[:, None]
+    return normals, (normals*a).sum(axis=1)
+
+def simplex(points, tolerance):
+    # Four extreme points spanning a volume, as outward triangles
+    extremes = np.concatenate([points.argmin(axis=0), points.argmax(axis=0)])
+    pairs = points[extremes][:, None, :] - points[extremes][None, :, :]
+    i, j = np.unravel_index(np.argmax((pairs**2).sum(axis=2)), pairs.shape[:2])
+    a, b = extremes[i], extremes[j]
+
+    direction = points[b] - points[a]
+    line = np.linalg.norm(np.cross(points - points[a], direction), axis=1)
+    c = int(np.argmax(line))
+    if line[c] <= tolerance*np.linalg.norm(direction):
+        raise ValueError("points are collinear")
+
+    normal = np.cross(direction, points[c] - points[a])
+    normal /= np.linalg.norm(normal)
+    height = (points - points[a]) @ normal
+    d = int(np.argmax(np.abs(height)))
+    if abs(height[d]) <= tolerance:
+        raise ValueError("points are coplanar")
+
+    triangles = np.array([(a, b, c), (a, c, d), (a, d, b), (b, d, c)])
+    if height[d] > 0:
+        # d lies above abc, so abc faces down: flip every face
+        triangles = triangles[:, ::-1]
+    return triangles
+
+def twins(triangles, count):
+    # For every edge (3 per triangle, in order) the index of the same edge
+    # running the other way, in a closed mesh
+    edges = triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    keys = edges[:, 0]*count + edges[:, 1]
+    order = np.argsort(keys)
+    return order[np.searchsorted(keys[order], edges[:, 1]*count + edges[:, 0])]
+
+def convexhull(points, tolerance=None):
+    """Outward triangles (indices into points) of the convex hull
+
+    Every face keeps the points above it. A step takes the farthest point
+    of the face with the farthest one, walks the faces that point sees
+    across their edges and only reassigns the points above those. A step
+    costs about as much as the faces and points it touches, not the whole
+    hull and point set: points all on the hull (e.g. on a sphere) make one
+    step per point, and 100k of them take seconds.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    if n < 4:
+        raise ValueError("a hull needs at least four points")
+    if tolerance is None:
+        tolerance = 1e-9*max(1.0, np.abs(points).max())
+
+    # Faces live in arrays that grow by doubling; dead faces stay behind.
+    # adjacent holds the face across every edge (a, b), (b, c), (c, a).
+    capacity = 2*n + 8
+    triangles = np.zeros((capacity, 3), dtype=np.int64)
+    adjacent = np.zeros((capacity, 3), dtype=np.int64)
+    normals = np.zeros((capacity, 3))
+    offsets = np.zeros(capacity)
+    alive = np.zeros(capacity, dtype=bool)
+    seen = np.zeros(capacity, dtype=bool)
+    count = 4
+    triangles[:4] = simplex(points, tolerance)
+    adjacent[:4] = (twins(triangles[:4], n)//3).reshape(4, 3)
+    normals[:4], offsets[:4] = planes(points, triangles[:4])
+    alive[:4] = True
+
+    # Every point outside the hull belongs to the face it is farthest
+    # above; the heap orders the faces by their farthest point and may hold
+    # faces removed since
+    members = {}
+    heap = []
+    def assign(candidates, first, faces):
+        d = points[candidates] @ normals[faces].T - offsets[faces]
+        best = d.argmax(axis=1)
+        height = d.max(axis=1)
+        outside = height > tolerance
+        candidates, best, height = candidates[outside], best[outside], height[outside]
+        for k in np.unique(best).tolist():
+            mine = best == k
+            members[first + k] = candidates[mine]
+            heapq.heappush(heap, (-height[mine].max(), first + k))
+
+    assign(np.arange(n), 0, np.arange(4))
+    # Where the new face of a horizon edge starts and ends, by vertex
+    starting = np.zeros(n, dtype=np.int64)
+    ending = np.zeros(n, dtype=np.int64)
+
+    while heap:
+        f = heapq.heappop(heap)[1]
+        above = members.pop(f, None)
+        if above is None or not alive[f]:
+            continue
+        p = int(above[np.argmax(points[above] @ normals[f])])
+
+        # The faces p sees, walking across edges from f
+        frontier = [f]
+        seen[f] = True
+        examined = visible = frontier
+        while len(frontier):
+            around = adjacent[frontier].ravel()
+            around = around[~seen[around]]
+            seen[around] = True
+            examined = np.concatenate([examined, around])
+            frontier = around[normals[around] @ points[p] - offsets[around] > tolerance]
+            visible = np.concatenate([visible, frontier])
+        seen[examined] = False
+        visible = np.unique(visible)
+
+        # The horizon: edges of visible faces whose neighbour is not visible
+        alive[visible] = False
+        rows, slots = np.nonzero(alive[adjacent[visible]])
+        faces = visible[rows]
+        outer = adjacent[faces, slots]
+        a = triangles[faces, slots]
+        b = triangles[faces, (slots + 1) % 3]
+
+        if count + len(a) > capacity:
+            grow = max(capacity, len(a))
+            triangles = np.concatenate([triangles, np.zeros((grow, 3), dtype=np.int64)])
+            adjacent = np.concatenate([adjacent, np.zeros((grow, 3), dtype=np.int64)])
+            normals = np.concatenate([normals, np.zeros((grow, 3))])
+            offsets = np.concatenate([offsets, np.zeros(grow)])
+            alive = np.concatenate([alive, np.zeros(grow, dtype=bool)])
+            seen = np.concatenate([seen, np.zeros(grow, dtype=bool)])
+            capacity += grow
+        first, count = count, count + len(a)
+        ids = np.arange(first, count)
+        triangles[first:count, 0], triangles[first:count, 1], triangles[first:count, 2] = a, b, p
+        # The horizon is a loop, so the faces (a, b, p) are joined along
+        # (b, p) and (p, a); the faces outside now border the new ones
+        starting[a], ending[b] = ids, ids
+        adjacent[first:count, 0], adjacent[first:count, 1], adjacent[first:count, 2] = outer, starting[b], ending[a]
+        adjacent[outer, (adjacent[outer] == faces[:, None]).argmax(axis=1)] = ids
+        normals[first:count], offsets[first:count] = planes(points, triangles[first:count])
+        alive[first:count] = True
+
+        # Only the points above the removed faces need a new owner
+        orphans = [above[above != p]]
+        orphans.extend(members.pop(v) for v in visible.tolist() if v in members)
+        orphans = np.concatenate(orphans)
+        if len(orphans):
+            assign(orphans, first, ids)
+
+    return triangles[:count][alive[:count]]
+
+def mergecoplanar(points, triangles, tolerance=1e-9):
+    "Convex polygons (vertex loops, counter-clockwise seen from outside) of a closed hull"
+    normals, offsets = planes(points, triangles)
+    count = len(triangles)
+
+    # Triangles on both sides of every edge
+    edges = triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    owner = np.repeat(np.arange(count), 3)
+    n = len(points)
+    neighbour = owner[twins(triangles, n)]
+
+    scale = max(1.0, np.abs(points).max())
+    same = ((normals[owner]*normals[neighbour]).sum(axis=1) > 1 - tolerance) & \
+           (np.abs(offsets[owner] - offsets[neighbour]) <= tolerance*scale)
+
+    # Label every triangle with the lowest triangle of its coplanar patch:
+    # spread the minimum over the coplanar edges, then jump pointers
+    groups = np.arange(count)
+    a, b = owner[same], neighbour[same]
+    while True:
+        low = np.minimum(groups[a], groups[b])
+        if np.array_equal(groups[a], low) and np.array_equal(groups[b], low):
+            break
+        np.minimum.at(groups, a, low)
+        np.minimum.at(groups, b, low)
+        groups = groups[groups]
+
+    # Boundary edges of every patch, chained into one loop per polygon
+    boundary = groups[owner] != groups[neighbour]
+    patch = groups[owner[boundary]]
+    start, end = edges[boundary, 0], edges[boundary, 1]
+    following = dict(zip((patch*n + start).tolist(), end.tolist()))
+    firsts = dict(zip(patch.tolist(), start.tolist()))
+
+    faces = []
+    for g, first in firsts.items():
+        loop, v = [first], following[g*n + first]
+        while v != first:
+            loop.append(v)
+            v = following[g*n + v]
+        faces.append(loop)
+    return faces
+
+def dropcollinear(points, faces, tolerance=1e-9):
+    # Corners where a polygon runs straight on; the neighbouring polygon
+    # runs straight through the same vertex, so it goes from both
+    scale = max(1.0, np.abs(points).max())
+    flat = np.concatenate(faces)
+    lengths = np.array([len(f) for f in faces])
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    position = np.arange(len(flat)) - starts
+    previous = flat[starts + (position - 1) % np.repeat(lengths, lengths)]
+    following = flat[starts + (position + 1) % np.repeat(lengths, lengths)]
+
+    p = points[flat]
+    turn = np.sqrt((cross(p - points[previous], points[following] - p)**2).sum(axis=1))
+    straight = np.zeros(len(points), dtype=bool)
+    straight[flat[turn <= tolerance*scale*scale]] = True
+    return [[v for v in face if not straight[v]] for face in faces]
+
+def polyhedron(points, tolerance=None):
+    "Vertices and polygon faces of the convex hull, with only the corners kept"
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    faces = dropcollinear(points, mergecoplanar(points, convexhull(points, tolerance)))
+
+    used = np.unique(np.concatenate(faces))
+    index = np.full(len(points), -1)
+    index[used] = np.arange(len(used))
+    return points[used], [index[f] for f in faces]
@@ -0,0 +1,146 @@
+"""
+Geometry kernel for the decorated cylinder.
+
+Everything in here works on plain NumPy arrays and does not need FreeCAD,
+so the meshes can be tested and benchmarked outside of it. A mesh is a pair
+of arrays: vertices (n x 3 floats) and triangles (m x 3 vertex indices),
+with all triangles oriented so their normals point out of the solid.
+"""
+import numpy as np
+from math import pi, sin, cos, sqrt
+
+
+def layerpoints(segments, radius):
+    # One point per segment plus the closing point, like the original loop
+    angles = np.arange(segments+1)*pi*2/segments
+    x = np.sin(angles)*radius
+    y = np.cos(angles)*radius
+
+    return x, y
+
+def layerheights(stripes, height):
+    return np.arange(stripes+1)*height/stripes
+
+def wallvertices(segments, stripes, height, radius):
+    # Grid of (stripes+1) rings of `segments` points, ring by ring
+    x, y = layerpoints(segments, radius)
+    z = layerheights(stripes, height)
+
+    vertices = np.empty((stripes+1, segments, 3))
+    vertices[:, :, 0] = x[:segments]
+    vertices[:, :, 1] = y[:segments]
+    vertices[:, :, 2] = z[:, None]
+    return vertices.reshape(-1, 3)
+
+def walltriangles(segments, stripes, reversed=False, outward=True, offset=0):
+    # Every stripe is twisted by one segment: the bottom edge (i, i+1) is
+    # connected to the top edge (i+1, i+2). With reversed set the twist goes
+    # the other way around.
+    l = np.arange(stripes)[:, None]
+    i = np.arange(segments)[None, :]
+    c, n = (l+1, l) if reversed else (l, l+1)
+
+    def v(layer, index):
+        return offset + layer*segments + index % segments
+
+    a = np.stack([v(c, i), v(c, i+1), v(n, i+2)], axis=-1).reshape(-1, 3)
+    b = np.stack([v(c, i), v(n, i+2), v(n, i+1)], axis=-1).reshape(-1, 3)
+
+    # Going up with increasing index gives normals pointing to the axis
+    triangles = np.stack([a, b], axis=1).reshape(-1, 3)
+    if outward != reversed:
+        triangles = triangles[:, ::-1]
+    return triangles
+
+def captriangles(segments, outer, inner, top=False):
+    # outer and inner are the vertex indices of both rings in the cap plane
+    p = np.arange(segments)
+    q = (p+1) % segments
+    a = np.stack([outer[p], outer[q], inner[q]], axis=-1)
+    b = np.stack([outer[p], inner[q], inner[p]], axis=-1)
+
+    triangles = np.stack([a, b], axis=1).reshape(-1, 3)
+    if top:
+        triangles = triangles[:, ::-1]
+    return triangles
+
+def wallmesh(segments, stripes, height, radius, reversed=False, outward=True):
+    vertices = wallvertices(segments, stripes, height, radius)
+    triangles = walltriangles(segments, stripes, reversed, outward)
+    return vertices, triangles
+
+def cylinderwalls(radius, thickness, height, segments, stripes, reversed=False):
+    # Outer and inner wall, plus the vertex rings bounding the end caps as
+    # (outer ring, inner ring) for the bottom and the top
+    ring = segments*(stripes+1)
+
+    vertices = np.concatenate([
+        wallvertices(segments, stripes, height, radius),
+        wallvertices(segments, stripes, height, radius - thickness)])
+
+    triangles = np.concatenate([
+        walltriangles(segments, stripes, reversed, outward=True),
+        walltriangles(segments, stripes, reversed, outward=False, offset=ring)])
+
+    bottom = np.arange(segments)
+    top = stripes*segments + bottom
+    rings = [(bottom, ring + bottom), (top, ring + top)]
+
+    return vertices, triangles, rings
+
+def caploops(rings):
+    # The end caps as faces with a hole: the outer ring counter-clockwise
+    # seen from outside, the inner ring clockwise
+    (outerbottom, innerbottom), (outertop, innertop) = rings
+    return [[outerbottom, innerbottom[::-1]], [outertop[::-1], innertop]]
+
+def cylindermesh(radius, thickness, height, segments, stripes, reversed=False):
+    # Outer wall, inner wall and both end caps as one closed mesh. The caps
+    # reuse the bottom and top rings of the walls.
+    vertices, triangles, rings = cylinderwalls(radius, thickness, height, segments, stripes, reversed)
+    (outerbottom, innerbottom), (outertop, innertop) = rings
+
+    triangles = np.concatenate([
+        triangles,
+        captriangles(segments, outerbottom, innerbottom),
+        captriangles(segments, outertop, innertop, top=True)])
+
+    return vertices, triangles
+
+def cylindermeasures(radius, thickness, height, segments, stripes):
+    """Volume, area and bounds (xmin, ymin, zmin, xmax, ymax, zmax) of the
+    solid cylindermesh() describes, without building it
+
+    The solid is a stack of congruent layers, one per stripe, and every
+    layer repeats after a turn of one segment, so the two wall triangles of
+    one segment give the walls: the volume from their signed tetrahedra
+    (divergence theorem), the area from their cross products. The twist
+    direction mirrors the solid and changes neither.
+    """
+    step, h = 2*pi/segments, height/stripes
+
+    def wall(r):
+        # Outward triangles (n2, c1, c0) and (n1, n2, c0) of segment 0
+        c0, c1 = (0.0, r, 0.0), (r*sin(step), r*cos(step), 0.0)
+        n1, n2 = (c1[0], c1[1], h), (r*sin(2*step), r*cos(2*step), h)
+        volume = area = 0.0
+        for a, b, c in ((n2, c1, c0), (n1, n2, c0)):
+            u = (b[0]-a[0], b[1]-a[1], b[2]-a[2])
+            v = (c[0]-a[0], c[1]-a[1], c[2]-a[2])
+            n = (u[1]*v[2] - u[2]*v[1], u[2]*v[0] - u[0]*v[2], u[0]*v[1] - u[1]*v[0])
+            volume += a[0]*n[0] + a[1]*n[1] + a[2]*n[2]
+            area += sqrt(n[0]*n[0] + n[1]*n[1] + n[2]*n[2])/2
+        return volume/6, area
+
+    inner = radius - thickness
+    outervolume, outerarea = wall(radius)
+    innervolume, innerarea = wall(inner)
+    # Each cap is the ring between two regular polygons; the bottom one
+    # lies in z = 0 and adds no volume
+    cap = segments*sin(step)*(radius*radius - inner*inner)/2
+    volume = segments*stripes*(outervolume - innervolume) + height*cap/3
+    area = segments*stripes*(outerarea + innerarea) + 2*cap
+
+    x, y = layerpoints(segments, radius)
+    bounds = (x[:segments].min(), y[:segments].min(), 0.0, x[:segments].max(), y[:segments].max(), height)
+    return volume, area, tuple(float(b) for b in bounds)
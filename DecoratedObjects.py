@@ -1,12 +1,22 @@
-import FreeCAD, FreeCADGui
+import FreeCAD
 import os
 import Part
+import Mesh
 from math import pi, floor
 import numpy as np
 
-path = os.path.dirname(__file__)
+import DecoratedGeometry
+import BrepBuilder
+import ShapeCache
+import Background
+import Recompute
+import Profiling
+import LazyShape
+import Measures
+import WorkerPool
+import FuseEngine
 
-uifile = os.path.join(path,"DecoratedCylinder.ui")
+path = os.path.dirname(__file__)
 
 def show(obj):
     stat = ""
@@ -51,158 +61,299 @@ class DecoratedCylinder:
                         "Reversed", 
                         "Visual",
                         "Direction of segments").Reversed=False                                                                        
+        self.addproperties(obj)
         self.Type = 'decoratedCylinder'
+        self.reset()
         obj.Proxy = self
 
+    def addproperties(self, obj):
+        # Properties added after the first release, also added to old documents
+        Profiling.addproperties(obj)
+        LazyShape.addproperties(obj)
+        Background.addproperties(obj)
+        Measures.addproperties(obj)
+        if not hasattr(obj, "OutputMode"):
+            # Follows the kind of feature, see setoutputmode() to change it
+            obj.addProperty("App::PropertyEnumeration",
+                            "OutputMode",
+                            "Visual",
+                            "Solid produces a Part shape, Mesh only the triangles")
+            obj.OutputMode = outputmodes
+            obj.OutputMode = outputmode(obj)
+            obj.setEditorMode("OutputMode", 1)
+        if not hasattr(obj, "Refine"):
+            obj.addProperty("App::PropertyBool",
+                            "Refine",
+                            "Visual",
+                            "Run removeSplitter on the result (not needed for the generated faces)").Refine = False
+        if not hasattr(obj, "Workers"):
+            obj.addProperty("App::PropertyInteger",
+                            "Workers",
+                            "Performance",
+                            "Worker processes building the walls in chunks of stripes (0 = all cores, 1 = serial)").Workers = 1
+
+    def reset(self):
+        # Last full build and the properties changed since then; not saved
+        self.base = None
+        self.dirty = set()
+        # Parameters of the build running in the background
+        self.pending = None
+
+    def onDocumentRestored(self, obj):
+        self.addproperties(obj)
+        LazyShape.restore(obj)
+
+    def __getstate__(self):
+        return { 'Type': self.Type }
+
+    def __setstate__(self, state):
+        self.Type = state.get('Type', 'decoratedCylinder')
+        self.reset()
+
     def onChanged(self, obj, prop):
-        pass
         #FreeCAD.Console.PrintMessage("Change property: " + str(prop) + "\n")
+        self.dirty.add(prop)
+        if prop == "StoreShape":
+            LazyShape.apply(obj)
 
     def layerpoints(self,obj,layer,radius):
-        angles = np.arange(obj.Segments+1)*pi*2/obj.Segments
-        x = np.sin(angles)*radius
-        y = np.cos(angles)*radius
-        
-        return x, y
+        return DecoratedGeometry.layerpoints(obj.Segments, radius)
         
     def cylinderfaces(self, obj, radius):
-        layers = np.arange(obj.Stripes+1)*obj.Height/obj.Stripes
-        x, y = self.layerpoints(obj,1, radius)
-
-        facelist = []
-        for l in range(obj.Stripes):
-            for i in range(obj.Segments):
-
-                nexti = (i+1) % obj.Segments
-                topi = (i+1) % obj.Segments
-                nextopi = (topi+1) % obj.Segments
-
-                c,n = l, l+1
-                if obj.Reversed:
-                    c,n = n,c
-                
-                #print("Making line from [{0}] to [{1}] at [{2}]".format(i,nexti,l))
-                #FreeCAD.Console.PrintMessage("Making line from [{0}] to [{1}] at [{2}]\n".format(i,nexti,l))
-                edge1 = Part.makeLine( (x[i],y[i],layers[c]), (x[nexti],y[nexti], layers[c]) )
-                edge2 = Part.makeLine( (x[nexti],y[nexti],layers[c]), (x[nextopi],y[nextopi], layers[n]) )
-                edge3 = Part.makeLine( (x[nextopi],y[nextopi],layers[n]), (x[i],y[i], layers[c]) )
-                wire = Part.Wire( [edge1, edge2, edge3 ])
-                face = Part.Face(wire)
-                facelist.append(face)
-
-                edge1 = Part.makeLine( (x[i],y[i],layers[c]), (x[nextopi],y[nextopi], layers[n]) )
-                edge2 = Part.makeLine( (x[nextopi],y[nextopi],layers[n]), (x[topi],y[topi], layers[n]) )
-                edge3 = Part.makeLine( (x[topi],y[topi],layers[n]), (x[i],y[i], layers[c]) )
-                wire = Part.Wire( [edge1, edge2, edge3 ])
-                face = Part.Face(wire)
-                facelist.append(face)
-
-        return facelist
-
+        vertices, triangles = DecoratedGeometry.wallmesh(
+            obj.Segments, obj.Stripes, obj.Height.Value, float(radius), obj.Reversed)
+        return BrepBuilder.faces(vertices, triangles)
+
+    def mesh(self, obj):
+        return DecoratedGeometry.cylindermesh(
+            obj.Radius.Value, obj.Thickness.Value, obj.Height.Value,
+            obj.Segments, obj.Stripes, obj.Reversed)
+
+    def parameters(self, obj):
+        return { 'Radius': obj.Radius.Value,
+                 'Thickness': obj.Thickness.Value,
+                 'Height': obj.Height.Value,
+                 'Segments': obj.Segments,
+                 'Stripes': obj.Stripes,
+                 'Reversed': obj.Reversed,
+                 'Refine': obj.Refine }
+
+    def valid(self, obj):
+        return obj.Segments >= 1 and obj.Stripes >= 1
 
     def execute(self, obj):
-        if obj.Segments < 1:
+        if not self.valid(obj):
             return
 
         FreeCAD.Console.PrintMessage("Recompute Python DecoratedCylinder feature\n")
         #FreeCAD.Console.PrintMessage("Current object: [{0}]\n".format(show(obj)))
 
-        outerfaces = self.cylinderfaces(obj, obj.Radius)
-        innerfaces = self.cylinderfaces(obj, obj.Radius - obj.Thickness)
-        facelist = innerfaces + outerfaces
-        
-        outerx, outery = self.layerpoints(obj, 1, obj.Radius)
-        innerx, innery = self.layerpoints(obj, 1, obj.Radius - obj.Thickness)
-
-        layers = np.arange(obj.Stripes+1)*obj.Height/obj.Stripes
-        for l in [ 0, obj.Height]:
-            for p in range(obj.Segments):
-                edge1 = Part.makeLine( (outerx[p],outery[p],l), (outerx[p+1],outery[p+1],l) )
-                edge2 = Part.makeLine( (outerx[p+1],outery[p+1],l), (innerx[p+1],innery[p+1],l) )
-                edge3 = Part.makeLine( (innerx[p+1],innery[p+1],l), (innerx[p],innery[p],l) )
-                edge4 = Part.makeLine( (innerx[p],innery[p],l), (outerx[p],outery[p],l) )
-                wire = Part.Wire( [edge1, edge2, edge3, edge4 ])
-                face = Part.Face(wire)
-                facelist.append(face)
-
-        shell = Part.makeShell(facelist)
-        solid = Part.makeSolid(shell)
-        obj.Shape = solid.removeSplitter()
-
-def createDecoratedCylinder():
-    cyl = FreeCAD.ActiveDocument.addObject('Part::FeaturePython', 'decoratedCylinder')
+        params = self.parameters(obj)
+        Measures.store(obj, massproperties(params))
+        if outputmode(obj) == "Mesh":
+            self.executemesh(obj)
+            return
+
+        with Profiling.profile(obj):
+            shape, path = self.update(obj, params)
+            Profiling.result(shape)
+            # A background build assigns the shape when it is done
+            if shape is not None:
+                with Profiling.phase("assign"):
+                    obj.Shape = shape
+            obj.LastUpdate = path
+
+    def executemesh(self, obj):
+        # Indexed triangles straight from the kernel, OCC is not involved
+        with Profiling.profile(obj):
+            with Profiling.phase("mesh"):
+                vertices, triangles = self.mesh(obj)
+            Profiling.primitives(len(triangles))
+            with Profiling.phase("makeMesh"):
+                mesh = Mesh.Mesh()
+                mesh.addFacets((vertices.tolist(), triangles.tolist()))
+            Profiling.result(mesh)
+            with Profiling.phase("assign"):
+                LazyShape.assign(obj, mesh)
+            obj.LastUpdate = "mesh"
+
+    def shape(self, obj):
+        "The solid for the current parameters, also for objects in Mesh mode"
+        shape, _ = self.update(obj, self.parameters(obj))
+        if shape is None:
+            # Running in the background, but the caller needs it now
+            shape = self.build(obj)
+        return shape
+
+    def update(self, obj, params):
+        if Background.busy(obj, params):
+            return None, "background"
+
+        # Pick the cheapest way to get from the last full build to params.
+        # Height and Reversed do not change the topology: Reversed twists the
+        # stripes the other way, which is the mirror image in z = Height/2.
+        if self.base is not None:
+            old, shape = self.base
+            changed = {k for k in params if params[k] != old[k]}
+            if changed <= {'Height', 'Reversed'} and not changed - self.dirty and old['Height'] > 0:
+                path = []
+                if 'Height' in changed:
+                    m = FreeCAD.Matrix()
+                    m.scale(FreeCAD.Vector(1, 1, params['Height']/old['Height']))
+                    shape = shape.transformGeometry(m)
+                    path.append("z-scale")
+                if 'Reversed' in changed:
+                    shape = shape.mirror(FreeCAD.Vector(0, 0, params['Height']/2), FreeCAD.Vector(0, 0, 1))
+                    path.append("mirror")
+                return shape, "+".join(path) or "unchanged"
+
+        key = ShapeCache.shapekey(self.Type, params)
+        with Profiling.phase("cache"):
+            shape = ShapeCache.cache().get(key)
+        path = "cache"
+        if shape is None:
+            if Background.start(obj, params, __name__, (params, obj.Workers)):
+                return None, "background"
+            shape = self.build(obj)
+            with Profiling.phase("cache"):
+                ShapeCache.cache().put(key, shape)
+            path = "full"
+
+        self.rebase(params, shape)
+        return shape, path
+
+    def rebase(self, params, shape):
+        # Later updates start from this build
+        self.base = (params, shape)
+        self.dirty = set()
+
+    def build(self, obj):
+        return buildshape(self.parameters(obj), obj.Workers)
+
+# Below this many wall triangles per worker a pool costs more than it saves
+chunksize = 5000
+
+def shellbrep(mesh):
+    # Runs in the worker processes
+    return Part.Shell(BrepBuilder.faces(*mesh)).exportBrepToString()
+
+def seams(bounds, segments):
+    """Which wall triangles border another chunk or a cap
+
+    bounds are the first row of every chunk and the end; the rows are the
+    stripes of the outer wall followed by those of the inner wall, with
+    2*segments triangles each.
+    """
+    rows = bounds[-1]
+    seam = np.zeros(rows, dtype=bool)
+    seam[bounds[:-1]] = seam[bounds[1:] - 1] = True
+    seam[[rows//2 - 1, rows//2]] = True
+    return np.repeat(seam, 2*segments)
+
+def parallelshell(vertices, triangles, caps, workers, segments):
+    # Every chunk of stripes and the caps become a shell in a worker, whose
+    # faces share their edges. Along the chunk boundaries and the caps they
+    # do not, so only the rows there are sewn.
+    rows = len(triangles)//(2*segments)
+    count = min(workers, len(triangles)//chunksize)
+    bounds = np.linspace(0, rows, count + 1).round().astype(int)
+    meshes = [BrepBuilder.submesh(vertices, triangles[a*2*segments:b*2*segments])
+              for a, b in zip(bounds[:-1], bounds[1:])]
+    meshes.append(BrepBuilder.submesh(vertices, polygons=caps))
+
+    breps = WorkerPool.parallelmap(shellbrep, meshes, workers)
+    faces = [f for brep in breps for f in FuseEngine.frombrep(brep).Faces]
+    seam = np.concatenate([seams(bounds, segments), np.ones(len(caps), dtype=bool)]).tolist()
+    with Profiling.phase("sew"):
+        sewn = Part.Shell([f for f, s in zip(faces, seam) if s])
+        sewn.sewShape()
+        # The sewing keeps the edges the seam rows share with the others
+        shell = Part.Shell([f for f, s in zip(faces, seam) if not s] + sewn.Faces)
+        if len(faces) != len(seam) or not shell.isClosed():
+            shell = Part.Shell(faces)
+            shell.sewShape()
+    return shell
+
+def buildshape(params, workers=1):
+    "Solid for DecoratedCylinder.parameters(); needs no document, so it also runs in workers"
+    with Profiling.phase("mesh"):
+        vertices, triangles, rings = DecoratedGeometry.cylinderwalls(
+            params['Radius'], params['Thickness'], params['Height'],
+            params['Segments'], params['Stripes'], params['Reversed'])
+    Profiling.primitives(len(triangles) + len(rings))
+    caps = DecoratedGeometry.caploops(rings)
+
+    shell = None
+    workers = WorkerPool.workercount(workers)
+    if workers > 1 and len(triangles) >= 2*chunksize:
+        try:
+            with Profiling.phase("parallel"):
+                shell = parallelshell(vertices, triangles, caps, workers, params['Segments'])
+        except Exception as e:
+            FreeCAD.Console.PrintWarning("Parallel build failed, building serially: {0}\n".format(e))
+
+    if shell is None:
+        # Every stripe is twisted by one segment, so no two wall triangles
+        # are coplanar. The caps are planar and become one annular face each,
+        # sharing their edges with the walls.
+        with Profiling.phase("faces"):
+            facelist = BrepBuilder.faces(vertices, triangles, caps)
+        with Profiling.phase("makeShell"):
+            shell = Part.Shell(facelist)
+    with Profiling.phase("makeSolid"):
+        solid = Part.Solid(shell)
+    if params['Refine']:
+        with Profiling.phase("removeSplitter"):
+            solid = solid.removeSplitter()
+    return solid
+
+def massproperties(params):
+    "Volume, area and bounds for DecoratedCylinder.parameters(), without building the solid"
+    return DecoratedGeometry.cylindermeasures(params['Radius'], params['Thickness'], params['Height'],
+                                              params['Segments'], params['Stripes'])
+
+outputmodes = ["Solid", "Mesh"]
+featuretypes = { "Solid": 'Part::FeaturePython', "Mesh": 'Mesh::FeaturePython' }
+
+def outputmode(obj):
+    return "Mesh" if obj.isDerivedFrom('Mesh::Feature') else "Solid"
+
+def createDecoratedCylinder(mode="Solid", doc=None):
+    doc = doc or FreeCAD.ActiveDocument
+    cyl = doc.addObject(featuretypes[mode], 'decoratedCylinder')
     DecoratedCylinder(cyl)
-    ViewProviderDecoratedCylinder(cyl.ViewObject)
-    FreeCAD.ActiveDocument.recompute()
+    if FreeCAD.GuiUp:
+        import DecoratedObjectsGui
+        DecoratedObjectsGui.ViewProviderDecoratedCylinder(cyl.ViewObject)
+    Recompute.request(cyl)
     
     return cyl
 
-class ViewProviderDecoratedCylinder:
-    def __init__(self, obj):
-        obj.Proxy = self
-
-    def attach(self, obj):
-        return
-
-    def updateData(self, fp, prop):
-        return
-
-    def getDisplayModes(self, obj):
-        return []
-
-    def getDefaultDisplayModes(self):
-        return "Shaded"
-
-    def setDisplayMode(self, mode):
-        return mode
-
-    def onChanged(self, obj, prop):
-        #FreeCAD.Console.PrintMessage("Change property: " + str(prop) + "\n")
-        #FreeCAD.Console.PrintMessage("Current object: [{0}]\n".format(show(obj)))
-        FreeCAD.ActiveDocument.recompute()
-
-    def doubleClicked(self, obj):
-        panel = DecoratedCylinderPanel(obj.Object)
-        panel.form.radius.setValue(obj.Object.Radius)
-        panel.form.thickness.setValue(obj.Object.Thickness)
-        panel.form.cylheight.setValue(obj.Object.Height)
-        panel.form.segments.setValue(obj.Object.Segments)
-        panel.form.stripes.setValue(obj.Object.Stripes)
-        panel.form.reverse.setChecked(obj.Object.Reversed)
-        FreeCADGui.Control.showDialog(panel)
-
-    def __getstate__(self):
-        return None
+def setoutputmode(obj, mode):
+    """Decorated cylinder like obj with the given output mode
+
+    The kind of a feature cannot change, so obj is replaced by a new one
+    with the same parameters. Objects that others depend on are kept.
+    """
+    if outputmode(obj) == mode:
+        return obj
+    if obj.InList:
+        FreeCAD.Console.PrintError("{0} is used by other objects, its output mode cannot change\n".format(obj.Label))
+        return obj
+
+    doc = obj.Document
+    cyl = createDecoratedCylinder(mode, doc)
+    for name in ("Radius", "Thickness", "Height", "Segments", "Stripes", "Reversed", "Refine", "Workers", "StoreShape", "Placement"):
+        setattr(cyl, name, getattr(obj, name))
+    label = obj.Label
+    doc.removeObject(obj.Name)
+    cyl.Label = label
+    return cyl
 
-    def __setstate__(self, state):
-        return None
-
-class DecoratedCylinderPanel:
-    def __init__(self, dc=None):
-        self.form = FreeCADGui.PySideUic.loadUi(uifile)
-        self.dc = dc
-
-    def accept(self):
-        radius = self.form.radius.value()
-        thickness = self.form.thickness.value()
-        height = self.form.cylheight.value()
-        segments = self.form.segments.value()
-        stripes = self.form.stripes.value()
-        reverse = self.form.reverse.isChecked()
-        if not self.dc:
-            self.dc = createDecoratedCylinder()
-        self.dc.Radius = radius
-        self.dc.Thickness = thickness
-        self.dc.Height = height
-        self.dc.Segments = segments
-        self.dc.Reversed = reverse
-        self.dc.Stripes = stripes
-        FreeCAD.ActiveDocument.recompute()
-        FreeCADGui.Control.closeDialog()
-
-
-"""
-print(uifile)
-panel = DecoratedCylinderPanel()
-FreeCADGui.Control.showDialog(panel)
-"""
\ No newline at end of file
+def __getattr__(name):
+    # View provider and panel live in the GUI module, which is only loaded
+    # when needed. Older documents still refer to them through this module.
+    if name in ("ViewProviderDecoratedCylinder", "DecoratedCylinderPanel"):
+        import DecoratedObjectsGui
+        return getattr(DecoratedObjectsGui, name)
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
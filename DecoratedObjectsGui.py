@@ -1,7 +1,112 @@
 import FreeCAD,FreeCADGui
 import os
 
-from DecoratedObjects import DecoratedCylinderPanel
+import Recompute
+import Background
+import Preview
+import DecoratedGeometry
+from DecoratedObjects import createDecoratedCylinder, setoutputmode, outputmode
+
+uifile = os.path.join(os.path.dirname(__file__),"DecoratedCylinder.ui")
+
+class ViewProviderDecoratedCylinder:
+    def __init__(self, obj):
+        obj.Proxy = self
+
+    def attach(self, obj):
+        return
+
+    def updateData(self, fp, prop):
+        return
+
+    def getDisplayModes(self, obj):
+        return []
+
+    def getDefaultDisplayModes(self):
+        return "Shaded"
+
+    def setDisplayMode(self, mode):
+        return mode
+
+    def onChanged(self, obj, prop):
+        #FreeCAD.Console.PrintMessage("Change property: " + str(prop) + "\n")
+        #FreeCAD.Console.PrintMessage("Current object: [{0}]\n".format(show(obj)))
+        Background.viewchanged(obj, prop)
+
+    def doubleClicked(self, obj):
+        panel = DecoratedCylinderPanel(obj.Object)
+        FreeCADGui.Control.showDialog(panel)
+
+    def __getstate__(self):
+        return None
+
+    def __setstate__(self, state):
+        return None
+
+class DecoratedCylinderPanel:
+    def __init__(self, dc=None):
+        self.form = FreeCADGui.PySideUic.loadUi(uifile)
+        self.dc = dc
+        if dc:
+            self.populate(dc)
+
+        f = self.form
+        self.preview = Preview.Preview(self.previewmesh, dc)
+        for spinbox in (f.radius, f.thickness, f.cylheight, f.segments, f.stripes):
+            spinbox.valueChanged.connect(self.preview.request)
+        f.reverse.toggled.connect(self.preview.request)
+        if not dc:
+            self.preview.request()
+
+    def populate(self, obj):
+        f = self.form
+        f.radius.setValue(obj.Radius)
+        f.thickness.setValue(obj.Thickness)
+        f.cylheight.setValue(obj.Height)
+        f.segments.setValue(obj.Segments)
+        f.stripes.setValue(obj.Stripes)
+        f.reverse.setChecked(obj.Reversed)
+        f.outputmode.setCurrentText(outputmode(obj))
+
+    def previewmesh(self):
+        # Same kernel as the feature, with the resolution capped
+        f = self.form
+        segments, stripes = Preview.limits()
+        radius, thickness, height = f.radius.value(), f.thickness.value(), f.cylheight.value()
+        if f.segments.value() < 1 or f.stripes.value() < 1 or height <= 0 or not 0 < thickness < radius:
+            return None
+        return DecoratedGeometry.cylindermesh(radius, thickness, height,
+                                              min(f.segments.value(), segments),
+                                              min(f.stripes.value(), stripes),
+                                              f.reverse.isChecked())
+
+    def reject(self):
+        self.preview.close()
+        FreeCADGui.Control.closeDialog()
+
+    def accept(self):
+        self.preview.close()
+        radius = self.form.radius.value()
+        thickness = self.form.thickness.value()
+        height = self.form.cylheight.value()
+        segments = self.form.segments.value()
+        stripes = self.form.stripes.value()
+        reverse = self.form.reverse.isChecked()
+        mode = self.form.outputmode.currentText()
+        with Recompute.batch("Decorated cylinder"):
+            if not self.dc:
+                self.dc = createDecoratedCylinder(mode)
+            else:
+                self.dc = setoutputmode(self.dc, mode)
+            self.dc.Radius = radius
+            self.dc.Thickness = thickness
+            self.dc.Height = height
+            self.dc.Segments = segments
+            self.dc.Reversed = reverse
+            self.dc.Stripes = stripes
+            Recompute.request(self.dc)
+        FreeCADGui.Control.closeDialog()
+
 
 class DecoratedCylinderCommand:
     "A Decorated Cylinder"
@@ -21,6 +126,26 @@ class DecoratedCylinderCommand:
         panel = DecoratedCylinderPanel()
         FreeCADGui.Control.showDialog(panel)
 
+def meshcylinders():
+    return [obj for obj in FreeCADGui.Selection.getSelection()
+            if hasattr(obj, "OutputMode") and outputmode(obj) == "Mesh"]
+
+class DecoratedCylinderSolidCommand:
+    "Turn decorated cylinders in Mesh mode into solids"
+
+    def GetResources(self):
+        return { "MenuText": "Convert Decorated Cylinder to solid",
+                 "ToolTip": "Rebuild the selected mesh cylinders as Part solids with the same parameters" }
+
+    def IsActive(self):
+        return FreeCAD.ActiveDocument != None and len(meshcylinders()) > 0
+
+    def Activated(self):
+        with Recompute.batch("Convert to solid"):
+            for obj in meshcylinders():
+                setoutputmode(obj, "Solid")
+
 FreeCADGui.addCommand('DecoratedCylinder', DecoratedCylinderCommand())
+FreeCADGui.addCommand('DecoratedCylinderSolid', DecoratedCylinderSolidCommand())
 
-toolbar = ( "Decorated Objects", [ 'DecoratedCylinder', ])
\ No newline at end of file
+toolbar = ( "Decorated Objects", [ 'DecoratedCylinder', 'DecoratedCylinderSolid', ])
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Boolean fuse of many primitives as a parallel tree reduction.
+
+The primitives are split into spatially coherent groups, every group is
+fused in a worker process and the partial results are merged pairwise,
+neighbour with neighbour, until one shape is left.
+"""
+import FreeCAD
+import Part
+import numpy as np
+from BOPTools import JoinAPI
+
+import WorkerPool
+
+# Below this many primitives per worker a pool costs more than it saves;
+# plain frames (50 primitives at most) always fuse serially
+groupsize = 32
+
+def partition(centers, indices, size):
+    # Recursive median split along the longest extent, so that neighbouring
+    # groups in the result are also neighbours in space
+    if len(indices) <= size:
+        return [indices]
+    points = centers[indices]
+    axis = np.argmax(points.max(axis=0) - points.min(axis=0))
+    order = indices[np.argsort(points[:, axis], kind='stable')]
+    half = len(order)//2
+    return partition(centers, order[:half], size) + partition(centers, order[half:], size)
+
+def connect(shapes):
+    if len(shapes) == 1:
+        return shapes[0]
+    return JoinAPI.connect(shapes, 0)
+
+def frombrep(brep):
+    shape = Part.Shape()
+    shape.importBrepFromString(brep)
+    return shape
+
+def fusebreps(breps):
+    # Runs in the worker processes
+    return connect([frombrep(b) for b in breps]).exportBrepToString()
+
+def fuse(shapes, workers=0):
+    workers = WorkerPool.workercount(workers)
+    if workers <= 1 or len(shapes) < 2*groupsize:
+        return connect(shapes)
+
+    try:
+        return parallelfuse(shapes, workers)
+    except Exception as e:
+        FreeCAD.Console.PrintWarning("Parallel fuse failed, fusing serially: {0}\n".format(e))
+        return connect(shapes)
+
+def parallelfuse(shapes, workers):
+    centers = np.array([tuple(s.BoundBox.Center) for s in shapes])
+    size = max(groupsize, -(-len(shapes)//workers))
+    groups = partition(centers, np.arange(len(shapes)), size)
+
+    breps = [s.exportBrepToString() for s in shapes]
+    level = WorkerPool.parallelmap(fusebreps, [[breps[i] for i in g] for g in groups], workers)
+
+    while len(level) > 1:
+        pairs = [level[i:i+2] for i in range(0, len(level), 2)]
+        level = WorkerPool.parallelmap(fusebreps, pairs, workers)
+
+    return frombrep(level[0])
@@ -34,10 +34,18 @@ class MyWorkbench ( Workbench ):
         self.appendToolbar(*DecoratedObjectsGui.toolbar)
         self.appendMenu(*DecoratedObjectsGui.toolbar)
 
+        import LatticeGui
+        self.appendToolbar(*LatticeGui.toolbar)
+        self.appendMenu(*LatticeGui.toolbar)
+
         import STLExportGui
         self.appendToolbar(*STLExportGui.toolbar)
         self.appendMenu(*STLExportGui.toolbar)
 
+        import ProfileGui
+        self.appendToolbar(*ProfileGui.toolbar)
+        self.appendMenu(*ProfileGui.toolbar)
+
         Log ("Loading My Workbench... done\n")
 
     def Activated(self):
@@ -0,0 +1,88 @@
+"""
+Lattices of platonic-solid frame cells on a cubic grid.
+
+Neighbouring cells share nodes (and, for cubes, struts). Every node of the
+lattice lies on the grid of half the cell pitch and every strut midpoint on
+the grid of a quarter pitch, so coincident nodes and struts are found by
+hashing their integer grid coordinates into flat mark arrays: linear in the
+number of cells, no sorting. Pure NumPy, like PlatonicGeometry.
+"""
+import numpy as np
+
+from PlatonicGeometry import topology, edgeframes, rotationmatrices, placements, strutmesh, spheremesh, instancemesh
+
+# Cells that fill space on a cubic grid with their nodes on the half-pitch grid
+cells = ["Cube", "Octahedron"]
+
+def cellframe(cell, pitch):
+    # Vertices of one cell centred on the origin and spanning one pitch
+    t = topology[cell]
+    extent = t.vertices[:, 0].max() - t.vertices[:, 0].min()
+    return t.vertices*(pitch/extent), t.edges
+
+def cellcenters(pitch, counts):
+    i, j, k = np.meshgrid(*[np.arange(n) for n in counts], indexing="ij")
+    return (np.stack([i, j, k], axis=-1).reshape(-1, 3) + 0.5)*pitch
+
+def gridkeys(points, quantum, shape):
+    # Linear index of every point on a grid of the given spacing
+    g = np.rint(points/quantum).astype(np.int64)
+    if np.abs(g*quantum - points).max(initial=0) > quantum*1e-6:
+        raise ValueError("points are not on the grid")
+    return np.ravel_multi_index(g.T, shape), g
+
+def dedupe(keys, size):
+    # New id for every key, numbering the distinct keys in grid order. The
+    # mark array holds one slot per grid position.
+    mark = np.zeros(size, dtype=bool)
+    mark[keys] = True
+    slots = np.flatnonzero(mark)
+    ids = np.full(size, -1, dtype=np.int64)
+    ids[slots] = np.arange(len(slots))
+    return ids[keys], slots
+
+def lattice(cell, pitch, counts):
+    "Distinct node positions and struts (pairs of node indices) of the lattice"
+    counts = tuple(int(n) for n in counts)
+    vertices, edges = cellframe(cell, pitch)
+    centers = cellcenters(pitch, counts)
+    points = (centers[:, None, :] + vertices[None, :, :]).reshape(-1, 3)
+    nv = len(vertices)
+    alledges = (edges[None, :, :] + (np.arange(len(centers))*nv)[:, None, None]).reshape(-1, 2)
+
+    # Nodes on the half-pitch grid
+    shape = tuple(2*n + 1 for n in counts)
+    keys, grid = gridkeys(points, pitch/2, shape)
+    nodeids, slots = dedupe(keys, int(np.prod(shape)))
+    nodes = np.stack(np.unravel_index(slots, shape), axis=1)*(pitch/2)
+
+    # Struts by their midpoint on the quarter-pitch grid
+    struts = nodeids[alledges]
+    struts = np.stack([struts.min(axis=1), struts.max(axis=1)], axis=1)
+    midpoints = grid[alledges[:, 0]] + grid[alledges[:, 1]]
+    doubled = tuple(4*n + 1 for n in counts)
+    midkeys = np.ravel_multi_index(midpoints.T, doubled)
+    strutids, _ = dedupe(midkeys, int(np.prod(doubled)))
+
+    first = np.empty(strutids.max(initial=-1) + 1, dtype=np.int64)
+    first[strutids[::-1]] = np.arange(len(strutids))[::-1]
+    unique = struts[first]
+    if not np.array_equal(unique[strutids], struts):
+        # Different struts crossing at their midpoints: deduplicate by pair
+        unique = np.unique(struts, axis=0)
+    return nodes, unique
+
+def instances(nodes, struts):
+    "Struts as {length: placements of a z-axis strut}, and the node placements, like frameinstances"
+    starts, lengths, q = edgeframes(nodes, struts)
+    matrices = placements(rotationmatrices(q), starts)
+    keys = np.round(lengths, 9)
+    return ({ float(k): matrices[keys == k] for k in np.unique(keys) },
+            placements(np.broadcast_to(np.eye(3), (len(nodes), 3, 3)), nodes))
+
+def latticemesh(nodes, struts, radius, segments):
+    # One triangle soup of overlapping strut and node meshes, for printing
+    strutplacements, nodeplacements = instances(nodes, struts)
+    parts = [(strutmesh(radius, length, segments), m) for length, m in strutplacements.items()]
+    parts.append((spheremesh(radius, segments), nodeplacements))
+    return instancemesh(parts)
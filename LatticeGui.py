@@ -0,0 +1,65 @@
+import FreeCAD,FreeCADGui
+import os
+
+import Recompute
+import Background
+from LatticeObject import createLattice
+
+class ViewProviderLattice:
+    def __init__(self, obj):
+        obj.Proxy = self
+
+    def attach(self, obj):
+        return
+
+    def updateData(self, fp, prop):
+        return
+
+    def getDisplayModes(self, obj):
+        return []
+
+    def getIcon(self):
+        return os.path.join(os.path.dirname(__file__),"simple-icosahedron.svg")
+
+    def getDefaultDisplayModes(self):
+        return "Shaded"
+
+    def setDisplayMode(self, mode):
+        return mode
+
+    def onChanged(self, vp, prop):
+        Background.viewchanged(vp, prop)
+
+    def __getstate__(self):
+        return None
+
+    def __setstate__(self, state):
+        return None
+
+
+class LatticeCommand:
+    "A lattice of frame cells"
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def GetResources(self):
+        if self.mode == "Mesh":
+            return { "MenuText": "Create Lattice mesh",
+                     "ToolTip": "Create a lattice of frame cells as one triangle mesh",
+                     "Pixmap": os.path.join(os.path.dirname(__file__),"simple-icosahedron.svg")}
+        return { "MenuText": "Create Lattice",
+                 "ToolTip": "Create a lattice of frame cells as a compound of struts and nodes",
+                 "Pixmap": os.path.join(os.path.dirname(__file__),"icosahedron.svg")}
+
+    def IsActive(self):
+        return FreeCAD.ActiveDocument != None
+
+    def Activated(self):
+        with Recompute.batch("Lattice"):
+            createLattice(self.mode)
+
+FreeCADGui.addCommand('Lattice', LatticeCommand("Compound"))
+FreeCADGui.addCommand('LatticeMesh', LatticeCommand("Mesh"))
+
+toolbar = ( "Lattice", [ 'Lattice', 'LatticeMesh', ])
@@ -0,0 +1,195 @@
+import FreeCAD
+import Part
+import Mesh
+
+import ShapeCache
+import Background
+import Recompute
+import Profiling
+import LazyShape
+import STLExport
+import PlatonicSolidObject
+from PlatonicGeometry import circlesegments
+from LatticeGeometry import cells, lattice, instances, latticemesh
+
+outputmodes = ["Compound", "Mesh"]
+featuretypes = { "Compound": 'Part::FeaturePython', "Mesh": 'Mesh::FeaturePython' }
+
+def outputmode(obj):
+    return "Mesh" if obj.isDerivedFrom('Mesh::Feature') else "Compound"
+
+class Lattice:
+    def __init__(self, obj):
+        obj.addProperty("App::PropertyEnumeration",
+                        "Cell",
+                        "Lattice",
+                        "Frame of every cell")
+        obj.Cell = cells
+        obj.Cell = 0
+        obj.addProperty("App::PropertyLength",
+                        "Pitch",
+                        "Lattice",
+                        "Size of a cell").Pitch = 10.0
+        obj.addProperty("App::PropertyLength",
+                        "StrutRadius",
+                        "Lattice",
+                        "Radius of the struts and nodes").StrutRadius = 1.0
+        for name in ("CountX", "CountY", "CountZ"):
+            obj.addProperty("App::PropertyInteger",
+                            name,
+                            "Lattice",
+                            "Number of cells along " + name[-1])
+            setattr(obj, name, 5)
+        obj.addProperty("App::PropertyInteger",
+                        "Segments",
+                        "Mesh",
+                        "Segments around the struts and nodes of the mesh").Segments = 12
+        self.addproperties(obj)
+
+        self.Type = 'lattice'
+        self.reset()
+        obj.Proxy = self
+
+    def addproperties(self, obj):
+        # Properties added after the first release, also added to old documents
+        Profiling.addproperties(obj)
+        LazyShape.addproperties(obj)
+        Background.addproperties(obj)
+        STLExport.addproperties(obj)
+        if not hasattr(obj, "OutputMode"):
+            obj.addProperty("App::PropertyEnumeration",
+                            "OutputMode",
+                            "Lattice",
+                            "Compound of instanced struts and nodes, or one triangle mesh")
+            obj.OutputMode = outputmodes
+            obj.OutputMode = outputmode(obj)
+            obj.setEditorMode("OutputMode", 1)
+
+    def reset(self):
+        # Parameters of the build running in the background; not saved
+        self.pending = None
+
+    def onDocumentRestored(self, obj):
+        self.addproperties(obj)
+        LazyShape.restore(obj)
+
+    def onChanged(self, obj, prop):
+        if prop == "StoreShape":
+            LazyShape.apply(obj)
+
+    def __getstate__(self):
+        return { 'Type': self.Type }
+
+    def __setstate__(self, state):
+        self.Type = state.get('Type', 'lattice')
+        self.reset()
+
+    def parameters(self, obj):
+        params = { 'Cell': obj.Cell,
+                   'Pitch': obj.Pitch.Value,
+                   'StrutRadius': obj.StrutRadius.Value,
+                   'Counts': [obj.CountX, obj.CountY, obj.CountZ] }
+        if outputmode(obj) == "Mesh":
+            params['Segments'] = obj.Segments
+        return params
+
+    def valid(self, obj):
+        return min(obj.CountX, obj.CountY, obj.CountZ) >= 1 and obj.Pitch.Value > 0 and obj.StrutRadius.Value > 0
+
+    def execute(self, obj):
+        if not self.valid(obj):
+            return
+
+        with Profiling.profile(obj):
+            params = self.parameters(obj)
+            if outputmode(obj) == "Mesh":
+                result, path = buildmesh(params), "mesh"
+            else:
+                result, path = self.update(obj, params)
+            Profiling.result(result)
+            if result is not None:
+                with Profiling.phase("assign"):
+                    if outputmode(obj) == "Mesh":
+                        LazyShape.assign(obj, result)
+                    else:
+                        obj.Shape = result
+            obj.LastUpdate = path
+
+    def update(self, obj, params):
+        if Background.busy(obj, params):
+            return None, "background"
+
+        key = ShapeCache.shapekey(self.Type, params)
+        with Profiling.phase("cache"):
+            shape = ShapeCache.cache().get(key)
+        if shape is not None:
+            return shape, "cache"
+
+        if Background.start(obj, params, __name__, (params,)):
+            return None, "background"
+
+        shape = buildshape(params)
+        with Profiling.phase("cache"):
+            ShapeCache.cache().put(key, shape)
+        return shape, "full"
+
+    def build(self, obj):
+        return buildshape(self.parameters(obj))
+
+    def frame(self, obj):
+        return lattice(obj.Cell, obj.Pitch.Value, (obj.CountX, obj.CountY, obj.CountZ))
+
+    def mesh(self, obj):
+        # The triangles of the mesh feature; compounds are tessellated
+        if outputmode(obj) != "Mesh":
+            return None
+        return latticemesh(*self.frame(obj), obj.StrutRadius.Value, obj.Segments)
+
+    def components(self, obj, linear, angular):
+        "Struts and nodes as (key, mesh function, placements), like PlatonicSolid.components"
+        radius = obj.StrutRadius.Value
+        segments = obj.Segments if outputmode(obj) == "Mesh" else circlesegments(radius, linear, angular)
+        nodes, struts = self.frame(obj)
+        return PlatonicSolidObject.frameparts(*instances(nodes, struts), radius, segments)
+
+
+def buildshape(params):
+    "Compound for Lattice.parameters(); needs no document, so it also runs in workers"
+    with Profiling.phase("lattice"):
+        nodes, struts = lattice(params['Cell'], params['Pitch'], params['Counts'])
+    radius = params['StrutRadius']
+
+    with Profiling.phase("primitives"):
+        shapes = PlatonicSolidObject.struts(nodes, struts, radius) + PlatonicSolidObject.nodes(nodes, radius)
+    Profiling.primitives(len(shapes))
+    with Profiling.phase("makeCompound"):
+        return Part.makeCompound(shapes)
+
+def buildmesh(params):
+    with Profiling.phase("lattice"):
+        nodes, struts = lattice(params['Cell'], params['Pitch'], params['Counts'])
+    with Profiling.phase("mesh"):
+        vertices, triangles = latticemesh(nodes, struts, params['StrutRadius'], params['Segments'])
+    Profiling.primitives(len(nodes) + len(struts))
+    with Profiling.phase("makeMesh"):
+        mesh = Mesh.Mesh()
+        mesh.addFacets((vertices.tolist(), triangles.tolist()))
+    return mesh
+
+def createLattice(mode="Compound", doc=None):
+    doc = doc or FreeCAD.ActiveDocument
+    obj = doc.addObject(featuretypes[mode], 'lattice')
+    Lattice(obj)
+    if FreeCAD.GuiUp:
+        import LatticeGui
+        LatticeGui.ViewProviderLattice(obj.ViewObject)
+    Recompute.request(obj)
+    return obj
+
+def __getattr__(name):
+    # The view provider lives in the GUI module, which is only loaded when
+    # needed. Documents refer to it through this module.
+    if name == "ViewProviderLattice":
+        import LatticeGui
+        return getattr(LatticeGui, name)
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -0,0 +1,119 @@
+"""
+Parameter-only storage of the generated shapes.
+
+With StoreShape off the Shape (or Mesh) property of a feature is transient:
+the document only saves the parameters, so it is small and opens without
+reading the heavy BREP. On restore the shape comes from the shape cache
+when it is there. Otherwise objects that are shown or that others depend on
+are rebuilt one by one while the GUI is idle, and all others the first time
+ensureshape() is asked for them: when they are shown or exported.
+"""
+import FreeCAD
+
+import ShapeCache
+
+_queue = []
+_timer = None
+
+def addproperties(obj):
+    if not hasattr(obj, "StoreShape"):
+        obj.addProperty("App::PropertyBool",
+                        "StoreShape",
+                        "Performance",
+                        "Save the shape in the document; off saves only the parameters and rebuilds the shape when needed").StoreShape = True
+
+def output(obj):
+    return "Mesh" if obj.isDerivedFrom('Mesh::Feature') else "Shape"
+
+def assign(obj, result):
+    """Set the Shape (or Mesh) of obj, keeping its placement
+
+    Outside of a recompute a Part feature takes over the placement of a
+    new shape, and a Mesh feature always does, so the result is placed
+    where obj is first. Shapes are not changed: they may be in the cache.
+    """
+    if output(obj) == "Mesh":
+        result.Placement = obj.Placement
+        obj.Mesh = result
+    elif hasattr(result, "located"):
+        obj.Shape = result.located(obj.Placement)
+    else:
+        result = result.copy(False)
+        result.Placement = obj.Placement
+        obj.Shape = result
+
+def apply(obj):
+    # Transient properties are not written to the document
+    obj.setPropertyStatus(output(obj), "-Transient" if obj.StoreShape else "Transient")
+
+def needsshape(obj):
+    if getattr(obj, "StoreShape", True):
+        return False
+    if output(obj) == "Mesh":
+        return obj.Mesh.CountFacets == 0
+    return obj.Shape.isNull()
+
+def cached(obj):
+    proxy = obj.Proxy
+    return ShapeCache.cache().get(ShapeCache.shapekey(proxy.Type, proxy.parameters(obj)))
+
+def ensureshape(obj):
+    "The shape (or mesh) of obj, rebuilt first when the document was saved without it"
+    if not needsshape(obj):
+        return getattr(obj, output(obj))
+
+    if output(obj) == "Mesh":
+        # Meshes are built straight from the parameters, never in the background
+        obj.Proxy.execute(obj)
+        return obj.Mesh
+
+    shape = cached(obj)
+    if shape is None:
+        shape = obj.Proxy.build(obj)
+        ShapeCache.cache().put(ShapeCache.shapekey(obj.Proxy.Type, obj.Proxy.parameters(obj)), shape)
+    assign(obj, shape)
+    obj.LastUpdate = "restored"
+    return obj.Shape
+
+def restore(obj):
+    "Called from onDocumentRestored, after the properties are complete"
+    apply(obj)
+    if not needsshape(obj):
+        return
+    if output(obj) == "Shape":
+        shape = cached(obj)
+        if shape is not None:
+            assign(obj, shape)
+            obj.LastUpdate = "cache"
+            return
+    if obj.Visibility or obj.InList:
+        if FreeCAD.GuiUp:
+            schedule(obj)
+        else:
+            ensureshape(obj)
+
+def schedule(obj):
+    global _timer
+    from PySide import QtCore
+
+    _queue.append((obj.Document.Name, obj.Name))
+    if _timer is None:
+        _timer = QtCore.QTimer()
+        _timer.setSingleShot(True)
+        _timer.timeout.connect(poll)
+    _timer.start(0)
+
+def poll():
+    # One object per turn of the event loop, so the GUI keeps up
+    if not _queue:
+        return
+    docname, name = _queue.pop(0)
+    doc = FreeCAD.listDocuments().get(docname)
+    obj = doc.getObject(name) if doc else None
+    if obj is not None:
+        try:
+            ensureshape(obj)
+        except Exception as e:
+            FreeCAD.Console.PrintError("Could not rebuild {0}: {1}\n".format(obj.Label, e))
+    if _queue:
+        _timer.start(0)
@@ -0,0 +1,32 @@
+"""
+Volume, area and bounds of the generated objects, from their parameters.
+
+Each object type has a massproperties(params) function next to its
+buildshape(params), with the same parameters, that computes these in closed
+form from the kernel geometry: no shape is built, so it is cheap enough for
+parameter sweeps. execute stores the values in read-only properties, so
+scripts can read them without touching the Shape.
+"""
+import FreeCAD
+
+def addproperties(obj):
+    for name, kind, doc in [
+            ("Volume", "App::PropertyVolume", "Volume of the generated solid"),
+            ("Area", "App::PropertyArea", "Surface area of the generated solid"),
+            ("BoundMin", "App::PropertyVector", "Lowest corner of the bounding box, without the placement"),
+            ("BoundMax", "App::PropertyVector", "Highest corner of the bounding box, without the placement")]:
+        if not hasattr(obj, name):
+            obj.addProperty(kind, name, "Measures", doc)
+            obj.setEditorMode(name, 1)
+
+def store(obj, measures):
+    volume, area, bounds = measures
+    obj.Volume = volume
+    obj.Area = area
+    obj.BoundMin = FreeCAD.Vector(*bounds[:3])
+    obj.BoundMax = FreeCAD.Vector(*bounds[3:])
+
+def boundbox(obj):
+    "The bounding box in document coordinates, like obj.Shape.BoundBox"
+    box = FreeCAD.BoundBox(obj.BoundMin, obj.BoundMax)
+    return box.transformed(obj.Placement.toMatrix())
@@ -1,7 +1,153 @@
 import FreeCAD,FreeCADGui
 import os
 
-from PlatonicSolidObject import PlatonicSolidPanel
+import Recompute
+import Background
+import Preview
+from PlatonicGeometry import gettopology, hulltopology, geodesic, solidmesh, framemesh
+from PlatonicSolidObject import createPlatonicSolid, platonicobjects, radii
+
+uifile = os.path.join(os.path.dirname(__file__),"PlatonicSolid.ui")
+
+class ViewProviderPlatonicSolid:
+    def __init__(self, obj):
+        obj.Proxy = self
+
+    def attach(self, obj):
+        return
+
+    def updateData(self, fp, prop):
+        return
+
+    def getDisplayModes(self, obj):
+        return []
+
+    def getIcon(self):
+        return os.path.join(os.path.dirname(__file__),"simple-icosahedron.svg")
+
+    def getDefaultDisplayModes(self):
+        return "Shaded"
+
+    def setDisplayMode(self, mode):
+        return mode
+
+    def onChanged(self, vp, prop):
+        Background.viewchanged(vp, prop)
+
+    def doubleClicked(self, obj):
+        panel = PlatonicSolidPanel(obj.Object)
+        FreeCADGui.Control.showDialog(panel)
+
+    def __getstate__(self):
+        return None
+
+    def __setstate__(self, state):
+        return None
+
+class PlatonicSolidPanel:
+    def __init__(self, platonic=None):
+        self.form = FreeCADGui.PySideUic.loadUi(uifile)
+        self.form.solid.insertItems(1, platonicobjects)
+        self.form.radiustype.insertItems(1, radii)
+        self.platonic = platonic
+        if platonic:
+            self.populate(platonic)
+
+        f = self.form
+        self.preview = Preview.Preview(self.previewmesh, platonic)
+        f.radius.valueChanged.connect(self.preview.request)
+        f.edgeradius.valueChanged.connect(self.preview.request)
+        f.solid.currentIndexChanged.connect(self.preview.request)
+        f.radiustype.currentIndexChanged.connect(self.preview.request)
+        f.solidobject.toggled.connect(self.preview.request)
+        if not platonic:
+            self.preview.request()
+
+    def previewmesh(self):
+        # Frames are shown as the overlapping meshes of struts and nodes,
+        # without the fuse. Geodesic solids are capped at a low frequency.
+        f = self.form
+        solid = f.solid.currentText()
+        if f.radius.value() <= 0:
+            return None
+        # The points and the frequency are only edited in the property view
+        if solid == "Custom":
+            if not self.platonic:
+                return None
+            solid = hulltopology([tuple(v) for v in self.platonic.Points])
+        if self.platonic:
+            solid = geodesic(solid, min(self.platonic.Frequency, Preview.preferences().GetInt("Frequency", 8)))
+        t = gettopology(solid)
+        if f.radiustype.currentText() == "Edge length":
+            factor = f.radius.value() / t.edgelength
+        else:
+            factor = f.radius.value() / t.radius
+
+        if f.solidobject.isChecked():
+            return solidmesh(solid, factor)
+        edgeradius = f.edgeradius.value()
+        if edgeradius <= 0:
+            return None
+        return framemesh(solid, factor, edgeradius, min(16, Preview.limits()[0]))
+
+    def reject(self):
+        self.preview.close()
+        FreeCADGui.Control.closeDialog()
+
+    def populate(self, obj):
+        f = self.form
+        if obj.ActiveMeasure == "Outer radius":
+            f.radius.setValue(obj.OuterRadius)            
+        elif obj.ActiveMeasure == "Edge length":
+            f.radius.setValue(obj.EdgeLength)
+        else:
+            print("Not setting any value [{0}]".format(obj.ActiveMeasure))
+            
+        f.radiustype.setCurrentIndex(radii.index(obj.ActiveMeasure))
+        f.solid.setCurrentIndex(platonicobjects.index(obj.Solid))
+        f.vertexpolygon.setChecked(obj.VertexPolygon)
+        f.cloud.setChecked(obj.Cloud)
+        f.solidobject.setChecked(obj.SolidObject)
+        f.edgeradius.setValue(obj.EdgeRadius)
+        
+    def accept(self):
+        self.preview.close()
+        f = self.form
+
+        solid = f.solid.currentText()
+        measure = f.radiustype.currentText()
+        radius = f.radius.value()
+        vertexpolygon = f.vertexpolygon.isChecked()
+        cloud = f.cloud.isChecked()
+        solidobject = f.solidobject.isChecked()
+        edgeradius = f.edgeradius.value()
+
+        #for i in dir(f.solid):
+        #    print("{0} -> [{1}]".format(i, getattr(f.solid,i)))
+
+        #print("Solid: {0} [{1}]".format(f.solid.currentText(), f.solid.currentIndex()))
+
+        with Recompute.batch("Platonic solid"):
+            if not self.platonic:
+                self.platonic = createPlatonicSolid()
+
+            self.platonic.Solid = solid
+            self.platonic.SolidObject = solidobject
+            self.platonic.VertexPolygon = vertexpolygon
+            self.platonic.Cloud = cloud
+            self.platonic.ActiveMeasure = measure
+            self.platonic.EdgeRadius = edgeradius
+
+            if measure == "Outer radius":
+                self.platonic.OuterRadius = radius
+                self.platonic.EdgeLength = 0
+            elif measure == "Edge length":
+                self.platonic.EdgeLength = radius
+                self.platonic.OuterRadius = 0
+            Recompute.request(self.platonic)
+
+        FreeCADGui.Control.closeDialog()
+
 
 class PlatonicSolidCommand:
     "A Platonic Solid"
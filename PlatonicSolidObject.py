@@ -1,135 +1,68 @@
-import FreeCAD, FreeCADGui
+import FreeCAD
 import os
 import Part
-from math import sqrt
+from math import isclose
 import numpy as np
-import BOPTools.JoinFeatures
-from BOPTools import JoinAPI
 
-path = os.path.dirname(__file__)
+import ShapeCache
+import Background
+import Recompute
+import Profiling
+import LazyShape
+import Measures
+import FuseEngine
+import STLExport
+import BrepBuilder
+from PlatonicGeometry import solidmesh, edgeframes, frameinstances, strutmesh, spheremesh, circlesegments, \
+     gettopology, hulltopology, geodesic, solidmeasures, framemeasures
 
-uifile = os.path.join(path,"PlatonicSolid.ui")
+path = os.path.dirname(__file__)
 
-platonicobjects = ["Cube", "Tetrahedron", "Octahedron", "Icosahedron", "Dodecahedron"]
+# Custom is the convex hull of the Points property
+platonicobjects = ["Cube", "Tetrahedron", "Octahedron", "Icosahedron", "Dodecahedron", "Custom"]
 radii = ["Outer radius", "Edge length"]
 
-PHI = (1 + sqrt(5))/2
-INVPHI = 1/PHI
-KSI = sqrt((5-sqrt(5))/2)
-
-platonic_solids = {
-    'Tetrahedron': {
-        'vertices' : [ (1,1,1), (1, -1, -1,), (-1, 1, -1), (-1, -1, 1) ],
-        'faces': [ (0,1,2), (0,1,3), (0,3,2), (1,2,3)],
-        'edges': [ (0,1), (0,2), (0,3), (1,2), (1,3), (2,3) ],
-        'radius': sqrt(3),
-        'edgelength': 2*sqrt(2), 
-    },
-    'Cube': {
-        'vertices': [ (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
-                      (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)],
-        'faces': [ (0,1,2,3), (1,2,6,5), (0,1,5,4), (0,3,7,4), (3,2,6,7), (4,5,6,7)],
-        'edges': [ (0,1), (0,3), (0,3), (0,4), (1,2), (1,5), (2,3), (2,6),
-                   (3,7), (4,5), (4,7), (5,6), (6,7)],
-        'radius': sqrt(3),
-        'edgelength': 2,
-    },
-    'Octahedron': {
-        'vertices': [ (0, 0, -1), (-1,0,0), (0,-1,0), (1,0,0), (0,1,0), (0,0,1)],
-        'faces': [ (0,1,2), (0,2,3), (0,3,4), (0,4,1), (5,1,2), (5,2,3), (5,3,4), (5,4,1)],
-        'radius': 1,
-        'edgelength': sqrt(2),
-    },
-    'Icosahedron': {
-        'vertices': [ (0, 1, -PHI), (0, -1, -PHI), (-PHI, 0, -1), (PHI,0, -1), 
-                      (-1,-PHI,0), (1, -PHI,0), (1, PHI, 0), (-1,PHI,0),
-                      (-PHI,0, 1), (PHI,0,1), (0,1,PHI), (0,-1,PHI), ],
-
-        'faces': [ (0,1,2), (0,1,3), (1,2,4), (1,4,5), (1,5,3), (3,5,9), (3,9,6),
-                   (3,6,0), (0,6,7), (0,7,2), (2,7,8), (2,8,4), (4,8,11), (4,11,5),
-                   (5,11,9), (9,10,6), (6,10,7), (7,10,8), (8,10,11), (11,10,9), ],
-        'radius': KSI * PHI,
-        'edgelength': 2,
-    },
-    'Dodecahedron': {
-        'vertices': [ (-INVPHI, 0, -PHI), (INVPHI, 0, -PHI), 
-                      (-1,-1,-1), (1,-1,-1), (1,1,-1), (-1,1,-1), 
-                      (0, -PHI, -INVPHI), (0, PHI, -INVPHI),
-                      (-PHI,-INVPHI,0), (PHI, -INVPHI,0), (PHI,INVPHI,0),(-PHI,INVPHI,0),
-                      (0, -PHI, INVPHI), (0, PHI, INVPHI),
-                      (-1,-1,1), (1,-1,1), (1,1,1), (-1,1,1), 
-                      (-INVPHI, 0, PHI), (INVPHI, 0, PHI), ],
-        'faces': [ (0,1,3,6,2), (0,1,4,7,5), (0,2,8,11,5), (1,3,9,10,4),
-                   (2,6,12,14,8), (3,9,15,12,6), (4, 7,13,16,10), (5,11,17,13,7),
-                   (8,14,18, 17,11), (10,16,19,15,9), (13,17,18,19,16), (12,15,19,18,14)],
-        'radius': sqrt(3),
-        'edgelength': 2/PHI,
-    }
-}
+# Version of the saved proxy state, see PlatonicSolid.onDocumentRestored;
+# documents without one were saved before SolidObject was honoured
+stateversion = 1
 
 def dirobject(obj, fmt):
     for i in dir(obj):
         print(fmt.format(i, getattr(obj,i)))
 
-def normalize( tup, factor):
-    return tuple( [x * factor for x in tup])
-
-def vnormalize( tup, factor=1):
-    return FreeCAD.Vector( tup[0]*factor, tup[1]*factor, tup[2]*factor)
-
-def matricize(faces):
-    def set(x,y):
-        matrix[x][y] = True
-        matrix[y][x] = True
+def instance(prototype, placement):
+    # Shares the geometry of the prototype, only the location differs
+    if hasattr(prototype, "located"):
+        return prototype.located(placement)
+    shape = prototype.copy(False)
+    shape.Placement = placement
+    return shape
 
-    def unset(x,y):
-        matrix[x][y] = False
-        matrix[y][x] = False
+def struts(vertices, edges, radius):
+    starts, lengths, rotations = edgeframes(vertices, edges)
 
-    size = max([y for x in faces for y in x])+1
-    matrix = np.zeros( (size,size), dtype=bool )
+    prototypes = {}
+    shapes = []
+    for start, length, q in zip(starts.tolist(), lengths.tolist(), rotations.tolist()):
+        # Edges of equal length share one prototype cylinder along z
+        key = round(length, 9)
+        if key not in prototypes:
+            prototypes[key] = Part.makeCylinder(radius, length)
+        placement = FreeCAD.Placement(FreeCAD.Vector(*start), FreeCAD.Rotation(*q))
+        shapes.append(instance(prototypes[key], placement))
+    return shapes
 
-    for f in faces:
-        lasti = None
-        firsti = None
-        for i in f:
-            if lasti is not None:
-                set(i,lasti)
-            else:
-                firsti = i
-            lasti = i
-        set(lasti,firsti)        
-    return matrix
+def nodes(vertices, radius):
+    prototype = Part.makeSphere(radius)
+    return [instance(prototype, FreeCAD.Placement(FreeCAD.Vector(*v), FreeCAD.Rotation()))
+            for v in vertices.tolist()]
 
 def cylindershapes(solid, factor=1, radius=0.2):
-    p = platonic_solids[solid]
-    faces = p['faces']
-    verts = p['vertices']
-    matrix = matricize(faces)
-
-    shapes = []
-    xrange,yrange = matrix.shape
-    
-    for x in range(xrange):
-        for y in range(x+1,yrange):
-            if matrix[x][y]:
-                start = vnormalize(verts[x],factor)
-                end = vnormalize(verts[y], factor)
-                direction = end-start
-                s = Part.makeCylinder(radius, direction.Length, start, direction)
-                shapes.append(s)
-    return shapes
+    t = gettopology(solid)
+    return struts(t.vertices*factor, t.edges, radius)
 
 def sphereshapes(solid, factor=1, radius=0.2):
-    p = platonic_solids[solid]
-    verts = p['vertices']
-
-    shapes = []
-    for v in verts:
-        center = vnormalize(v, factor)
-        s = Part.makeSphere(radius, center)
-        shapes.append(s)
-    return shapes
+    return nodes(gettopology(solid).vertices*factor, radius)
 
 class PlatonicSolid:
     def __init__(self, obj):
@@ -156,7 +89,7 @@ class PlatonicSolid:
         obj.addProperty("App::PropertyBool", 
                         "SolidObject", 
                         "Platonic solid",
-                        "Create solid object").SolidObject = True
+                        "Create solid object").SolidObject = False
         obj.addProperty("App::PropertyLength", 
                         "OuterRadius", 
                         "Platonic solid",
@@ -169,11 +102,89 @@ class PlatonicSolid:
                         "EdgeRadius", 
                         "Platonic solid",
                         "Edge Radius").EdgeRadius = 2.0
-
+        self.addproperties(obj)
 
         self.Type = 'platonicSolid'
+        self.Version = stateversion
+        self.reset()
         obj.Proxy = self
 
+    def addproperties(self, obj):
+        # Properties added after the first release, also added to old documents
+        Profiling.addproperties(obj)
+        LazyShape.addproperties(obj)
+        Background.addproperties(obj)
+        STLExport.addproperties(obj)
+        Measures.addproperties(obj)
+        if "Custom" not in obj.getEnumerationsOfProperty("Solid"):
+            solid = obj.Solid
+            obj.Solid = platonicobjects
+            obj.Solid = solid
+        if not hasattr(obj, "Points"):
+            obj.addProperty("App::PropertyVectorList",
+                            "Points",
+                            "Platonic solid",
+                            "Points whose convex hull is the Custom solid")
+        if not hasattr(obj, "Frequency"):
+            obj.addProperty("App::PropertyInteger",
+                            "Frequency",
+                            "Platonic solid",
+                            "Subdivisions of every edge, with the points pushed onto the circumsphere (1 = plain solid)").Frequency = 1
+        if not hasattr(obj, "Fuse"):
+            obj.addProperty("App::PropertyBool",
+                            "Fuse",
+                            "Platonic solid",
+                            "Fuse the frame into one solid, otherwise keep a compound of instances").Fuse = True
+        if not hasattr(obj, "Refine"):
+            obj.addProperty("App::PropertyBool",
+                            "Refine",
+                            "Platonic solid",
+                            "Run removeSplitter on the fused frame").Refine = False
+        if not hasattr(obj, "FuseWorkers"):
+            obj.addProperty("App::PropertyInteger",
+                            "FuseWorkers",
+                            "Performance",
+                            "Worker processes fusing the frame (0 = all cores, 1 = serial)").FuseWorkers = 1
+
+    def reset(self):
+        # Last full build and the properties changed since then; not saved
+        self.base = None
+        self.dirty = set()
+        # Parameters of the build running in the background
+        self.pending = None
+
+    def onDocumentRestored(self, obj):
+        if self.Version < 1:
+            # Saved before SolidObject was honoured, when every object built
+            # the frame whatever it said: keep building the frame
+            obj.SolidObject = False
+        self.Version = stateversion
+        self.addproperties(obj)
+        LazyShape.restore(obj)
+
+    def __getstate__(self):
+        return { 'Type': self.Type, 'Version': self.Version }
+
+    def __setstate__(self, state):
+        self.Type = state.get('Type', 'platonicSolid')
+        self.Version = state.get('Version', 0)
+        self.reset()
+
+    def onChanged(self, obj, prop):
+        self.dirty.add(prop)
+        if prop == "StoreShape":
+            LazyShape.apply(obj)
+
+    def valid(self, obj):
+        # Only the points of the custom solid can fail to make one
+        if obj.Solid != "Custom":
+            return True
+        try:
+            self.solidtopology(obj)
+        except ValueError:
+            return False
+        return True
+
     def execute(self, obj):
         FreeCAD.Console.PrintMessage("Recompute Python DecoratedCylinder feature\n")
         #c1 = Part.makeCylinder(obj.OuterRadius,20)
@@ -188,229 +199,214 @@ class PlatonicSolid:
 
         #dirobject(self, "Self[{0}] -> [{1}]")
         #dirobject(obj, "Obj[{0}] -> [{1}]")
-        #rst = self.platonicsolid(obj)
-        rst = self.cylinders(obj)
-        #print("Got: [{0}]".format(rst))
-        obj.Shape = rst
+        if obj.Solid == "Custom":
+            try:
+                self.solidtopology(obj)
+            except ValueError as e:
+                FreeCAD.Console.PrintError("{0}: no solid from the points: {1}\n".format(obj.Label, e))
+                return
+
+        params = self.parameters(obj)
+        Measures.store(obj, massproperties(params))
+        with Profiling.profile(obj):
+            rst, path = self.update(obj, params)
+            #print("Got: [{0}]".format(rst))
+            Profiling.result(rst)
+            # A background build assigns the shape when it is done
+            if rst is not None:
+                with Profiling.phase("assign"):
+                    obj.Shape = rst
+            obj.LastUpdate = path
 
         #solidfacefusion = doc.addObject("Part::MultiFuse", f"{name}_solidfaces")
         #obj.Shape = Part.makeCylinder(obj.OuterRadius,20)
         #obj.Shape = s
 
-    def determinefactor(self,obj):
-        platonic_solid = platonic_solids[obj.Solid]
-        radius = platonic_solid['radius']
-
-        if obj.ActiveMeasure == "Outer radius":            
-            factor = obj.OuterRadius / radius
-            #print(f"Setting Outerradius: {obj.OuterRadius}")
-        elif obj.ActiveMeasure == "Edge length":
-            factor = obj.EdgeLength / platonic_solid['edgelength']
-            #print(f"Setting edgelength: {obj.EdgeLength}")
+    def parameters(self, obj):
+        if obj.ActiveMeasure == "Outer radius":
+            size = obj.OuterRadius.Value
         else:
-            print("Not setting any factor [{0}]".format(obj.ActiveMeasure))
-            return
-        return factor
-
-    def cylinders(self, obj, outerradius=None, edgelength=None, edgeradius=None):
-        platonic_solid = platonic_solids[obj.Solid]
+            size = obj.EdgeLength.Value
+        params = { 'Solid': obj.Solid,
+                   'SolidObject': obj.SolidObject,
+                   'ActiveMeasure': obj.ActiveMeasure,
+                   'Size': size,
+                   'EdgeRadius': obj.EdgeRadius.Value,
+                   'Fuse': obj.Fuse,
+                   'Refine': obj.Refine,
+                   # Only the custom solid depends on the points
+                   'Points': [tuple(v) for v in obj.Points] if obj.Solid == "Custom" else [],
+                   'Frequency': max(1, obj.Frequency) }
+        return params
+
+    def solidtopology(self, obj):
+        if obj.Solid == "Custom":
+            return geodesic(hulltopology([tuple(v) for v in obj.Points]), obj.Frequency)
+        return geodesic(obj.Solid, obj.Frequency)
+
+    # Properties each parameter is derived from
+    sources = { 'Size': ('OuterRadius', 'EdgeLength', 'ActiveMeasure') }
+
+    def update(self, obj, params):
+        if Background.busy(obj, params):
+            return None, "background"
+
+        # Pick the cheapest way to get from the last full build to params. A
+        # change of size is a uniform scale, as long as the edge radius of a
+        # frame was scaled along in proportion.
         factor = self.determinefactor(obj)
-        #print(f"Factor: {factor} ({outerradius}) ({edgelength})")
+        if self.base is not None:
+            old, oldfactor, shape = self.base
+            changed = {k for k in params.keys() | old.keys() if params.get(k) != old.get(k)}
+            observed = all(self.dirty & set(self.sources.get(k, (k,))) for k in changed)
+            if params['SolidObject']:
+                changed -= {'EdgeRadius', 'Fuse'}
+            if changed <= {'ActiveMeasure', 'Size', 'EdgeRadius'} and observed and oldfactor > 0:
+                scale = factor/oldfactor
+                if params['SolidObject'] or isclose(params['EdgeRadius'], old['EdgeRadius']*scale, rel_tol=1e-9):
+                    if isclose(scale, 1, rel_tol=1e-12):
+                        return shape, "unchanged"
+                    shape = shape.copy()
+                    shape.scale(scale)
+                    return shape, "scale"
+
+        key = ShapeCache.shapekey(self.Type, params)
+        with Profiling.phase("cache"):
+            shape = ShapeCache.cache().get(key)
+        path = "cache"
+        if shape is None:
+            if Background.start(obj, params, __name__, (params, obj.FuseWorkers)):
+                return None, "background"
+            shape = self.build(obj)
+            with Profiling.phase("cache"):
+                ShapeCache.cache().put(key, shape)
+            path = "full"
+
+        self.rebase(params, shape, factor)
+        return shape, path
+
+    def rebase(self, params, shape, factor=None):
+        # Later updates start from this build
+        self.base = (params, sizefactor(params) if factor is None else factor, shape)
+        self.dirty = set()
+
+    def build(self, obj):
+        return buildshape(self.parameters(obj), obj.FuseWorkers)
 
-        edgeradius = obj.EdgeRadius
-        if edgeradius is None:
-            edgeradius = factor*platonic_solid['edgelength']/20
-            #print(f"Edgeradius redetermined at {edgeradius}")
-
-        cylinderlist = cylindershapes(obj.Solid, factor=factor, radius=edgeradius)
-        spheres = sphereshapes(obj.Solid, factor=factor, radius=edgeradius)
-
-        objects = []
-
-        rst = JoinAPI.connect(cylinderlist + spheres, 0)
-        #if selfobj.Refine:
-        rst = rst.removeSplitter()
-        return rst
-
-    def platonicsolid(self, obj,
-                  edgelength=None):
-        
-        platonic_solid=platonic_solids[obj.Solid]
-
-        #doc = FreeCAD.activeDocument()
-        #print(doc.supportedTypes())
-        radius = platonic_solid['radius']
+    def determinefactor(self,obj):
+        platonic_solid = self.solidtopology(obj)
+        radius = platonic_solid.radius
 
         if obj.ActiveMeasure == "Outer radius":            
-            factor = obj.OuterRadius / radius
+            factor = obj.OuterRadius.Value / radius
             #print(f"Setting Outerradius: {obj.OuterRadius}")
         elif obj.ActiveMeasure == "Edge length":
-            factor = obj.EdgeLength / platonic_solid['edgelength']
+            factor = obj.EdgeLength.Value / platonic_solid.edgelength
             #print(f"Setting edgelength: {obj.EdgeLength}")
         else:
             print("Not setting any factor [{0}]".format(obj.ActiveMeasure))
             return
+        return factor
 
-        #print(f"Factor: {factor} = {factor/platonic_solid['radius']} * R")
-        #print(f"Solid Edge length: {platonic_solid['edgelength']}")
-
-        if obj.VertexPolygon:
-            p = Part.makePolygon( [ normalize(x, factor) for x in platonic_solid['vertices']])
-            solidwire(doc, p, name=f"{name}_vertices", radius=factor*platonic_solid['edgelength']/20)
-        
-        platonic_solid['edges'] = []
-
-        if obj.Cloud:
-            spheres = []
-            for i, vertex in enumerate(platonic_solid['vertices']):
-                s = doc.addObject("Part::Sphere", f"{name}_sphere{i}")
-                s.Radius = 0.2
-                p = FreeCAD.Placement()
-                p.Base = FreeCAD.Vector( normalize( (vertex[0], vertex[1], vertex[2]), factor))
-                s.Placement = p
-                s.Visibility = False
-                spheres.append(s)
-
-            spherefusion = doc.addObject("Part::MultiFuse", f"{name}_cloud")
-            spherefusion.Shapes = spheres
-        
-        facelist = []
-        solidfaces = []
-        for i, face in enumerate(platonic_solid['faces']):
-            edgelist = []
-            verts = platonic_solid['vertices']
-            prev = None
-            for v in face:
-                if prev is not None:
-                    edge = Part.makeLine( normalize( verts[prev], factor), normalize( verts[v], factor ))
-                    edgelist.append(edge)
-                prev = v
-            edge = Part.makeLine( normalize( verts[prev], factor), normalize( verts[face[0]], factor) )
-            edgelist.append(edge)
-            wire = Part.Wire(edgelist)
-            if obj.SolidOutline:
-                solidfaces.append(solidwire(doc, wire, f"{name}_face{i}", radius=factor*platonic_solid['edgelength']/20))
-            face = Part.Face(wire)
-            facelist.append(face)
-
-        if obj.SolidOutline:
-            solidfacefusion = doc.addObject("Part::MultiFuse", f"{name}_solidfaces")
-            solidfacefusion.Shapes = solidfaces
-
-            rst = JoinAPI.connect(solidfaces, 0)
-            #if selfobj.Refine:
-            #    rst = rst.removeSplitter()
-            return rst
+    def mesh(self, obj):
+        # Only the solid is made of planar faces; frames need tessellation
+        if not obj.SolidObject:
+            return None
+        return solidmesh(self.solidtopology(obj), self.determinefactor(obj))
 
+    def components(self, obj, linear, angular):
+        "Frames as (key, mesh function, placements) of the strut and node meshes"
         if obj.SolidObject:
-            shell = Part.makeShell(facelist)
-            return Part.makeSolid(shell)
-            #solid = doc.addObject( "Part::Feature", name)
-            #solid.Shape = Part.makeSolid(shell)
-
-
-class ViewProviderPlatonicSolid:
-    def __init__(self, obj):
-        obj.Proxy = self
-
-    def attach(self, obj):
-        return
-
-    def updateData(self, fp, prop):
-        return
-
-    def getDisplayModes(self, obj):
-        return []
-
-    def getIcon(self):
-        return os.path.join(os.path.dirname(__file__),"simple-icosahedron.svg")
-
-    def getDefaultDisplayModes(self):
-        return "Shaded"
-
-    def setDisplayMode(self, mode):
-        return mode
-
-    def onChanged(self, vp, prop):
-        FreeCAD.ActiveDocument.recompute()
-
-    def doubleClicked(self, obj):
-        panel = PlatonicSolidPanel(obj.Object)
-        panel.populate(obj.Object)
-        FreeCADGui.Control.showDialog(panel)
-
-    def __getstate__(self):
-        return None
+            return None
+        radius = obj.EdgeRadius.Value
+        struts, nodes = frameinstances(self.solidtopology(obj), self.determinefactor(obj))
+        return frameparts(struts, nodes, radius, circlesegments(radius, linear, angular))
+
+
+def frameparts(struts, nodes, radius, segments):
+    # One strut mesh per length and one node mesh, each with its placements
+    parts = [(("strut", radius, length, segments), lambda length=length: strutmesh(radius, length, segments), m)
+             for length, m in struts.items()]
+    parts.append((("node", radius, segments), lambda: spheremesh(radius, segments), nodes))
+    return parts
+
+def paramsolid(params):
+    # Name of a registered solid, or the topology of the custom points or
+    # of the geodesic subdivision
+    solid = params['Solid']
+    if solid == "Custom":
+        solid = hulltopology(params['Points'])
+    if params['Frequency'] > 1:
+        solid = geodesic(solid, params['Frequency'])
+    return solid
+
+def sizefactor(params):
+    t = gettopology(paramsolid(params))
+    if params['ActiveMeasure'] == "Edge length":
+        return params['Size'] / t.edgelength
+    return params['Size'] / t.radius
+
+def buildshape(params, workers=0):
+    "Shape for PlatonicSolid.parameters(); needs no document, so it also runs in workers"
+    factor = sizefactor(params)
+    if params['SolidObject']:
+        return solidshape(paramsolid(params), factor)
+    return frameshape(paramsolid(params), factor, params['EdgeRadius'],
+                      params['Fuse'], params['Refine'], workers)
+
+def massproperties(params):
+    "Volume, area and bounds for PlatonicSolid.parameters(), without building the shape"
+    factor = sizefactor(params)
+    if params['SolidObject']:
+        return solidmeasures(paramsolid(params), factor)
+    return framemeasures(paramsolid(params), factor, params['EdgeRadius'], params['Fuse'])
+
+def frameshape(solid, factor, edgeradius, fuse=True, refine=False, workers=0):
+    with Profiling.phase("primitives"):
+        cylinderlist = cylindershapes(solid, factor=factor, radius=edgeradius)
+        spheres = sphereshapes(solid, factor=factor, radius=edgeradius)
+    Profiling.primitives(len(cylinderlist) + len(spheres))
+
+    if not fuse:
+        with Profiling.phase("makeCompound"):
+            return Part.makeCompound(cylinderlist + spheres)
+
+    with Profiling.phase("connect"):
+        rst = FuseEngine.fuse(cylinderlist + spheres, workers)
+    if refine:
+        with Profiling.phase("removeSplitter"):
+            rst = rst.removeSplitter()
+    return rst
+
+def solidshape(solid, factor):
+    t = gettopology(solid)
+    Profiling.primitives(len(t.faces))
+
+    with Profiling.phase("faces"):
+        if isinstance(t.faces, np.ndarray) and t.faces.shape[1] == 3:
+            # Geodesic subdivisions: all triangles
+            facelist = BrepBuilder.faces(t.vertices*factor, triangles=t.faces)
+        else:
+            facelist = BrepBuilder.faces(t.vertices*factor, polygons=[[face] for face in t.faces])
 
-    def __setstate__(self):
-        return None
+    with Profiling.phase("makeShell"):
+        shell = Part.Shell(facelist)
+    with Profiling.phase("makeSolid"):
+        return Part.Solid(shell)
 
 def createPlatonicSolid():
     p = FreeCAD.ActiveDocument.addObject('Part::FeaturePython', 'platonicSolid')
     PlatonicSolid(p)
-    ViewProviderPlatonicSolid(p.ViewObject)
-    FreeCAD.ActiveDocument.recompute()
+    if FreeCAD.GuiUp:
+        import PlatonicSolidGui
+        PlatonicSolidGui.ViewProviderPlatonicSolid(p.ViewObject)
+    Recompute.request(p)
     return p
 
-class PlatonicSolidPanel:
-    def __init__(self, platonic=None):
-        self.form = FreeCADGui.PySideUic.loadUi(uifile)
-        self.form.solid.insertItems(1, platonicobjects)
-        self.form.radiustype.insertItems(1, radii)
-        self.platonic = platonic
-
-    def populate(self, obj):
-        f = self.form
-        if obj.ActiveMeasure == "Outer radius":
-            f.radius.setValue(obj.OuterRadius)            
-        elif obj.ActiveMeasure == "Edge length":
-            f.radius.setValue(obj.EdgeLength)
-        else:
-            print("Not setting any value [{0}]".format(obj.ActiveMeasure))
-            
-        f.radiustype.setCurrentIndex(radii.index(obj.ActiveMeasure))
-        f.solid.setCurrentIndex(platonicobjects.index(obj.Solid))
-        f.vertexpolygon.setChecked(obj.VertexPolygon)
-        f.cloud.setChecked(obj.Cloud)
-        f.solidobject.setChecked(obj.SolidObject)
-        f.edgeradius.setValue(obj.EdgeRadius)
-        
-    def accept(self):
-        f = self.form
-
-        solid = f.solid.currentText()
-        measure = f.radiustype.currentText()
-        radius = f.radius.value()
-        vertexpolygon = f.vertexpolygon.isChecked()
-        cloud = f.cloud.isChecked()
-        solidobject = f.solidobject.isChecked()
-        edgeradius = f.edgeradius.value()
-
-        #for i in dir(f.solid):
-        #    print("{0} -> [{1}]".format(i, getattr(f.solid,i)))
-
-        #print("Solid: {0} [{1}]".format(f.solid.currentText(), f.solid.currentIndex()))
-
-        if not self.platonic:
-            self.platonic = createPlatonicSolid()
-
-        self.platonic.Solid = solid
-        self.platonic.SolidObject = solidobject
-        self.platonic.VertexPolygon = vertexpolygon
-        self.platonic.Cloud = cloud
-        self.platonic.ActiveMeasure = measure
-        self.platonic.EdgeRadius = edgeradius
-
-        
-        if measure == "Outer radius":
-            self.platonic.OuterRadius = radius
-            self.platonic.EdgeLength = 0
-        elif measure == "Edge length":
-            self.platonic.EdgeLength = radius
-            self.platonic.OuterRadius = 0
-
-        FreeCAD.ActiveDocument.recompute()
-        FreeCADGui.Control.closeDialog()
-
-#panel = PlatonicSolidPanel()
-#FreeCADGui.Control.showDialog(panel)                        
\ No newline at end of file
+def __getattr__(name):
+    # View provider and panel live in the GUI module, which is only loaded
+    # when needed. Older documents still refer to them through this module.
+    if name in ("ViewProviderPlatonicSolid", "PlatonicSolidPanel"):
+        import PlatonicSolidGui
+        return getattr(PlatonicSolidGui, name)
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -0,0 +1,100 @@
+"""
+Live preview for the task panels.
+
+The panels hand a function that returns a coarse mesh (vertices and
+triangles as NumPy arrays) for the values in the form. Changes are
+collected for a short delay, then the mesh is shown as a plain Coin node in
+the active 3D view; no document object is created and nothing is
+recomputed. The object being edited is hidden while the preview is up.
+"""
+import FreeCAD,FreeCADGui
+import numpy as np
+from PySide import QtCore
+from pivy import coin
+
+import STLWriter
+
+def preferences():
+    return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Mark/Preview")
+
+def limits():
+    "Resolution caps of the preview: (segments, stripes)"
+    p = preferences()
+    return p.GetInt("Segments", 96), p.GetInt("Stripes", 24)
+
+def meshnode(vertices, triangles):
+    node = coin.SoSeparator()
+
+    material = coin.SoMaterial()
+    material.diffuseColor = (0.35, 0.6, 0.9)
+    material.transparency = 0.2
+    hints = coin.SoShapeHints()
+    hints.vertexOrdering = coin.SoShapeHints.COUNTERCLOCKWISE
+    hints.shapeType = coin.SoShapeHints.SOLID
+
+    coordinates = coin.SoCoordinate3()
+    coordinates.point.setValues(0, len(vertices), vertices.tolist())
+    faces = coin.SoIndexedFaceSet()
+    index = np.hstack([triangles, np.full((len(triangles), 1), -1)]).ravel().tolist()
+    faces.coordIndex.setValues(0, len(index), index)
+
+    for child in (material, hints, coordinates, faces):
+        node.addChild(child)
+    return node
+
+
+class Preview:
+    def __init__(self, build, obj=None):
+        # build() returns (vertices, triangles) for the current form values,
+        # or None when they do not describe anything
+        self.build = build
+        self.obj = obj
+        self.node = None
+        self.hidden = False
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.refresh)
+
+    def request(self, *args):
+        # Connected to the valueChanged signals; restarting the timer drops
+        # the values that were only passed through
+        self.timer.start(preferences().GetInt("Delay", 150))
+
+    def scenegraph(self):
+        view = FreeCADGui.ActiveDocument and FreeCADGui.ActiveDocument.ActiveView
+        return view.getSceneGraph() if hasattr(view, "getSceneGraph") else None
+
+    def refresh(self):
+        try:
+            data = self.build()
+        except Exception as e:
+            FreeCAD.Console.PrintLog("No preview: {0}\n".format(e))
+            data = None
+        self.remove()
+        graph = self.scenegraph()
+        if data is None or graph is None:
+            return
+
+        vertices, triangles = data
+        if self.obj is not None:
+            if not self.obj.Placement.isIdentity():
+                vertices = STLWriter.transform(vertices, self.obj.Placement.toMatrix().A)
+            if not self.hidden and self.obj.ViewObject.Visibility:
+                self.obj.ViewObject.Visibility = False
+                self.hidden = True
+        self.node = meshnode(vertices, triangles)
+        graph.addChild(self.node)
+
+    def remove(self):
+        if self.node is not None:
+            graph = self.scenegraph()
+            if graph is not None:
+                graph.removeChild(self.node)
+            self.node = None
+
+    def close(self):
+        self.timer.stop()
+        self.remove()
+        if self.hidden:
+            self.obj.ViewObject.Visibility = True
+            self.hidden = False
@@ -0,0 +1,25 @@
+import FreeCADGui
+import FreeCAD
+
+import Profiling
+
+class ProfileDumpCommand:
+    "Print the recompute profile of every object"
+
+    def GetResources(self):
+        return { "MenuText": "Dump recompute profile",
+                 "ToolTip": "Print the per-phase recompute timings of every object in the document" }
+
+    def IsActive(self):
+        return FreeCAD.ActiveDocument != None
+
+    def Activated(self):
+        lines = Profiling.table(FreeCAD.ActiveDocument.Objects)
+        if not lines:
+            FreeCAD.Console.PrintMessage("No profiled objects in {0}\n".format(FreeCAD.ActiveDocument.Label))
+            return
+        FreeCAD.Console.PrintMessage("\n".join(lines) + "\n")
+
+FreeCADGui.addCommand('ProfileDump', ProfileDumpCommand())
+
+toolbar = ( "Profile", [ 'ProfileDump', ])
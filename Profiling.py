@@ -0,0 +1,107 @@
+"""
+Per-phase timing of recomputes.
+
+A feature wraps its execute in profile(obj) and the builders mark their
+phases with phase(name). When the recompute is done the timings end up in
+read-only properties on the object, and in the report view when its
+ProfileLog property is set.
+"""
+import FreeCAD
+import threading, time
+from contextlib import contextmanager
+
+_active = threading.local()
+
+
+class Profile:
+    def __init__(self):
+        self.phases = {}
+        self.primitives = 0
+        self.faces = 0
+        self.total = 0.0
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+def current():
+    stack = getattr(_active, "stack", None)
+    return stack[-1] if stack else None
+
+@contextmanager
+def phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        p = current()
+        if p is not None:
+            p.add(name, time.perf_counter() - start)
+
+def primitives(count):
+    p = current()
+    if p is not None:
+        p.primitives += count
+
+def result(shape):
+    p = current()
+    if p is not None and shape is not None:
+        p.faces = shape.CountFacets if hasattr(shape, "CountFacets") else len(shape.Faces)
+
+@contextmanager
+def profile(obj):
+    p = Profile()
+    if not hasattr(_active, "stack"):
+        _active.stack = []
+    _active.stack.append(p)
+    start = time.perf_counter()
+    try:
+        yield p
+    finally:
+        p.total = time.perf_counter() - start
+        _active.stack.pop()
+        store(obj, p)
+
+def addproperties(obj):
+    for name, kind, doc in [
+            ("ProfilePhases", "App::PropertyMap", "Seconds spent in each phase of the last recompute"),
+            ("ProfileTotal", "App::PropertyFloat", "Seconds spent in the last recompute"),
+            ("PrimitiveCount", "App::PropertyInteger", "Faces or solids the last recompute started from"),
+            ("FaceCount", "App::PropertyInteger", "Faces of the resulting shape, or facets of the mesh"),
+            ("RecomputeCount", "App::PropertyInteger", "Recomputes since the object was created")]:
+        if not hasattr(obj, name):
+            obj.addProperty(kind, name, "Profile", doc)
+            obj.setEditorMode(name, 1)
+    if not hasattr(obj, "ProfileLog"):
+        obj.addProperty("App::PropertyBool", "ProfileLog", "Profile",
+                        "Print the timings of every recompute to the report view").ProfileLog = False
+
+def store(obj, p):
+    if not hasattr(obj, "RecomputeCount"):
+        return
+    obj.ProfilePhases = { name: "{0:.6f}".format(seconds) for name, seconds in p.phases.items() }
+    obj.ProfileTotal = p.total
+    obj.PrimitiveCount = p.primitives
+    obj.FaceCount = p.faces
+    obj.RecomputeCount = obj.RecomputeCount + 1
+
+    if obj.ProfileLog:
+        phases = ", ".join("{0} {1:.3f} s".format(name, seconds) for name, seconds in p.phases.items())
+        FreeCAD.Console.PrintMessage("{0}: {1:.3f} s ({2}), {3} primitives, {4} faces\n".format(
+            obj.Label, p.total, phases, p.primitives, p.faces))
+
+def table(objects):
+    "Profile of every profiled object as lines of text"
+    objects = [obj for obj in objects if hasattr(obj, "RecomputeCount")]
+    if not objects:
+        return []
+
+    width = max(len(obj.Label) for obj in objects)
+    lines = ["{0:<{w}}  {1:>6}  {2:>9}  {3:>10}  {4:>8}  {5}".format(
+        "Object", "Count", "Seconds", "Primitives", "Faces", "Phases", w=width)]
+    for obj in objects:
+        phases = ", ".join("{0} {1}".format(name, seconds) for name, seconds in
+                           sorted(obj.ProfilePhases.items(), key=lambda item: -float(item[1])))
+        lines.append("{0:<{w}}  {1:>6}  {2:>9.3f}  {3:>10}  {4:>8}  {5}".format(
+            obj.Label, obj.RecomputeCount, obj.ProfileTotal, obj.PrimitiveCount, obj.FaceCount, phases, w=width))
+    return lines
@@ -0,0 +1,110 @@
+"""
+Coalesced recomputes.
+
+Instead of calling document.recompute() after every property change, code
+asks for one with request(). Inside a batch() the requests are only
+collected and a single recompute per document runs when the outermost batch
+ends. Outside a batch a request can be debounced: it then waits until no new
+request came in for `delay` milliseconds.
+
+A request for an object only recomputes that object, what it depends on and
+what depends on it; a request for a document recomputes all of it.
+
+    with Recompute.batch("Edit cylinder"):
+        obj.Radius = 3
+        obj.Height = 20
+        Recompute.request(obj)
+"""
+import FreeCAD
+from contextlib import contextmanager
+
+_depth = 0
+# Document name -> (document, names of the requested objects, or None for all)
+_pending = {}
+_timer = None
+
+def preferences():
+    return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Mark/Recompute")
+
+def defaultdelay():
+    return preferences().GetInt("Delay", 200)
+
+def request(target=None, delay=0):
+    "Ask for a recompute of a document, or of the document of an object"
+    if target is None:
+        target = FreeCAD.ActiveDocument
+    if target is None:
+        return
+
+    doc = getattr(target, "Document", target)
+    _, names = _pending.get(doc.Name, (doc, set()))
+    if doc is target or names is None:
+        names = None
+    else:
+        names.add(target.Name)
+    _pending[doc.Name] = (doc, names)
+
+    if _depth > 0:
+        return
+    if delay and FreeCAD.GuiUp:
+        schedule(delay)
+    else:
+        flush()
+
+def flush():
+    if _timer is not None:
+        _timer.stop()
+
+    pending = list(_pending.values())
+    _pending.clear()
+
+    opened = FreeCAD.listDocuments().values()
+    for doc, names in pending:
+        # The document may have been closed while the request was waiting
+        if not any(doc is d for d in opened):
+            continue
+        if names is None:
+            doc.recompute()
+            continue
+        # recompute(objs) takes care of what the objects depend on, but
+        # not of the objects depending on them. Objects may have been
+        # deleted in the meantime.
+        objects = [doc.getObject(name) for name in sorted(names)]
+        objects = [obj for obj in objects if obj is not None]
+        dependents = [d for obj in objects for d in obj.InListRecursive]
+        if objects:
+            doc.recompute(list({obj.Name: obj for obj in objects + dependents}.values()))
+
+def schedule(delay):
+    global _timer
+    from PySide import QtCore
+
+    if _timer is None:
+        _timer = QtCore.QTimer()
+        _timer.setSingleShot(True)
+        _timer.timeout.connect(flush)
+    # Restarting the timer pushes the recompute back: debouncing
+    _timer.start(delay)
+
+@contextmanager
+def batch(transaction=None, doc=None):
+    "Suspend recomputes, run one for every touched document at the end"
+    global _depth
+    doc = doc or FreeCAD.ActiveDocument
+    if transaction and doc:
+        doc.openTransaction(transaction)
+
+    _depth += 1
+    try:
+        yield
+    except Exception:
+        if transaction and doc:
+            doc.abortTransaction()
+        raise
+    finally:
+        _depth -= 1
+
+    if _depth == 0:
+        flush()
+    if transaction and doc:
+        doc.commitTransaction()
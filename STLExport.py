@@ -0,0 +1,264 @@
+"""
+STL export of one or many objects.
+
+Every file is written from a thread pool as soon as its mesh is ready.
+Objects that provide their own triangles (a mesh() method on the proxy)
+are written directly, which is NumPy work that runs concurrently. All
+others are tessellated with MeshPart, which holds the GIL, so their shapes
+go to the WorkerPool processes as BREP strings and come back as arrays.
+
+Next to every file a small JSON fingerprint and the deflection are kept;
+objects whose fingerprint did not change are skipped. For the features of
+this module the fingerprint comes from their parameters and placement, so
+an unchanged feature is skipped without building its shape. For all other
+objects it comes from the exported geometry. Tessellations are kept in a
+memory-bounded LRU for repeated exports within a session.
+"""
+import FreeCAD as App
+import os, math, time, json, hashlib, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import Part, MeshPart
+import numpy as np
+
+import STLWriter
+import WorkerPool
+import LazyShape
+import ShapeCache
+from ShapeCache import LRUCache
+
+_lock = threading.Lock()
+_tessellations = None
+
+def tessellations():
+    global _tessellations
+    if _tessellations is None:
+        limit = preferences().GetInt("TessellationCacheMegabytes", 256)*1024*1024
+        _tessellations = LRUCache(limit, sizeof=lambda data: data[0].nbytes + data[1].nbytes)
+    return _tessellations
+
+def preferences():
+    return App.ParamGet("User parameter:BaseApp/Preferences/Mod/Mark/STL")
+
+def facetdata(obj):
+    # Triangles straight from the feature, for objects made only of planar
+    # triangles. None means the shape has to be tessellated.
+    proxy = getattr(obj, "Proxy", None)
+    if not hasattr(proxy, "mesh"):
+        return None
+
+    data = proxy.mesh(obj)
+    if data is None:
+        return None
+
+    vertices, triangles = data
+    if not obj.Placement.isIdentity():
+        vertices = STLWriter.transform(vertices, obj.Placement.toMatrix().A)
+    return vertices, triangles
+
+def addproperties(obj):
+    if not hasattr(obj, "LinearDeflection"):
+        obj.addProperty("App::PropertyLength",
+                        "LinearDeflection",
+                        "Export",
+                        "Linear deflection of the tessellation (0 = from the preferences and the size of the object)")
+    if not hasattr(obj, "AngularDeflection"):
+        obj.addProperty("App::PropertyAngle",
+                        "AngularDeflection",
+                        "Export",
+                        "Angular deflection of the tessellation (0 = from the preferences)")
+
+def size(obj):
+    # Diagonal of the bounding box; the measures of the features have it
+    # without building the shape
+    if hasattr(obj, "BoundMin"):
+        return (obj.BoundMax - obj.BoundMin).Length
+    if hasattr(obj, "Shape") and not obj.Shape.isNull():
+        return obj.Shape.BoundBox.DiagonalLength
+    return 0
+
+def deflection(obj):
+    """Linear (mm) and angular (radians) deflection for an object
+
+    Objects can set their own LinearDeflection and AngularDeflection
+    properties. Otherwise the linear deflection is the old fixed 0.1 mm,
+    loosened for large objects to a fraction of their size.
+    """
+    p = preferences()
+    linear = float(getattr(getattr(obj, "LinearDeflection", 0), "Value", 0))
+    if linear <= 0:
+        linear = p.GetFloat("LinearDeflection", 0.1)
+        linear = max(linear, size(obj)*p.GetFloat("RelativeDeflection", 0.001))
+
+    angular = float(getattr(getattr(obj, "AngularDeflection", 0), "Value", 0))
+    if angular <= 0:
+        angular = p.GetFloat("AngularDeflection", 3)
+
+    return linear, angular*math.pi/180
+
+def filename(obj):
+    _dir, _name = os.path.split(obj.Document.FileName)
+    meshName = "{}-{}.stl".format(obj.Document.Name, obj.Label)
+    return os.path.join(_dir, meshName)
+
+def exportable(obj):
+    # Features with parameters that build nothing have nothing to export
+    proxy = getattr(obj, "Proxy", None)
+    if hasattr(proxy, "valid") and not proxy.valid(obj):
+        return False
+    if hasattr(proxy, "mesh"):
+        return True
+    return hasattr(obj, "Shape") and not obj.Shape.isNull()
+
+def fingerprint(data, brep):
+    h = hashlib.sha1()
+    if data is not None:
+        vertices, triangles = data
+        h.update(vertices.tobytes())
+        h.update(triangles.tobytes())
+    else:
+        h.update(brep.encode("utf-8"))
+    return h.hexdigest()
+
+def parameterstamp(obj, linear, angular):
+    # Fingerprint of a feature from what its shape is built from, or None
+    # for objects without parameters
+    proxy = getattr(obj, "Proxy", None)
+    if not hasattr(proxy, "parameters"):
+        return None
+    placement = list(obj.Placement.toMatrix().A)
+    data = json.dumps([ShapeCache.cacheversion, proxy.Type, proxy.parameters(obj), placement], sort_keys=True)
+    return { 'fingerprint': hashlib.sha1(data.encode("utf-8")).hexdigest(), 'linear': linear, 'angular': angular }
+
+def geometrystamp(data, brep, linear, angular):
+    stamp = { 'fingerprint': fingerprint(data, brep) }
+    if data is None:
+        stamp.update(linear=linear, angular=angular)
+    return stamp
+
+def fingerprintfile(name):
+    return name + ".fingerprint"
+
+def unchanged(name, stamp):
+    try:
+        with open(fingerprintfile(name)) as f:
+            return os.path.exists(name) and json.load(f) == stamp
+    except (OSError, ValueError):
+        return False
+
+def topologyarrays(mesh):
+    points, facets = mesh.Topology
+    vertices = np.array([tuple(p) for p in points], dtype=np.float64).reshape(-1, 3)
+    return vertices, np.array(facets, dtype=np.int64).reshape(-1, 3)
+
+def meshbrep(job):
+    # Runs in the worker processes
+    brep, linear, angular = job
+    shape = Part.Shape()
+    shape.importBrepFromString(brep)
+    mesh = MeshPart.meshFromShape(Shape=shape, LinearDeflection=linear, AngularDeflection=angular, Relative=False)
+    return topologyarrays(mesh)
+
+def tessellate(brep, key, linear, angular, workers=0):
+    "Vertices and triangles of a BREP string, meshed in a worker process"
+    with _lock:
+        data = tessellations().get(key)
+    if data is None:
+        data = None
+        if WorkerPool.workercount(workers) > 1:
+            # The thread only waits for the process, without the GIL
+            try:
+                data = WorkerPool.parallelmap(meshbrep, [(brep, linear, angular)], workers)[0]
+            except Exception as e:
+                App.Console.PrintWarning("Meshing in a worker process failed, meshing here: {0}\n".format(e))
+        if data is None:
+            data = meshbrep((brep, linear, angular))
+        with _lock:
+            tessellations().put(key, data)
+    return data
+
+def writefile(name, data, brep, linear, angular, force=False, workers=0, stamp=None):
+    # Runs in the pool; only gets copies, never touches the document.
+    # Returns None when the file is up to date. A stamp given by the
+    # caller has been checked already.
+    start = time.perf_counter()
+    if stamp is None:
+        stamp = geometrystamp(data, brep, linear, angular)
+        if not force and unchanged(name, stamp):
+            return None
+
+    if data is None:
+        data = tessellate(brep, (stamp['fingerprint'], linear, angular), linear, angular, workers)
+    STLWriter.writeStl(name, *data)
+    facets = len(data[1])
+
+    with open(fingerprintfile(name), "w") as f:
+        json.dump(stamp, f)
+    return facets, time.perf_counter() - start
+
+def exportObjects(objects, workers=0, force=False):
+    workers = workers or preferences().GetInt("Workers", 0) or os.cpu_count() or 1
+
+    jobs = []
+    results = []
+    for obj in objects:
+        if obj.Document.FileName == "":
+            App.Console.PrintError("Cannot export {0} from unsaved document\n".format(obj.Label))
+            continue
+        if not exportable(obj):
+            App.Console.PrintWarning("Nothing to export for {0}\n".format(obj.Label))
+            continue
+        # Everything that reads the document happens here, on the main thread.
+        # Unchanged features are skipped before their shape is rebuilt.
+        name = filename(obj)
+        linear, angular = deflection(obj)
+        stamp = parameterstamp(obj, linear, angular)
+        if stamp is not None and not force and unchanged(name, stamp):
+            results.append((obj.Label, name, "unchanged", None, None))
+            continue
+        data = facetdata(obj)
+        brep = LazyShape.ensureshape(obj).exportBrepToString() if data is None else None
+        jobs.append((obj.Label, name, data, brep, linear, angular, stamp))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = { pool.submit(writefile, *job[1:6], force=force, workers=workers, stamp=job[6]): job
+                    for job in jobs }
+        for future in as_completed(futures):
+            label, name, data, _, linear, _, _ = futures[future]
+            mode = "direct" if data is not None else "{0:g} mm".format(linear)
+            try:
+                written = future.result()
+            except Exception as e:
+                App.Console.PrintError("STL export of {0} failed: {1}\n".format(label, e))
+                results.append((label, name, "failed", None, None))
+                continue
+            if written is None:
+                results.append((label, name, "unchanged", None, None))
+                continue
+            facets, seconds = written
+            App.Console.PrintMessage("STL file generated at {}\n".format(name))
+            results.append((label, name, mode, facets, seconds))
+
+    report(results)
+    return results
+
+def exportDocuments(documents=None, workers=0, force=False):
+    "Export every visible object of the given (default: all open) documents"
+    if documents is None:
+        documents = App.listDocuments().values()
+    objects = [obj for doc in documents for obj in doc.Objects
+               if getattr(obj, "Visibility", True) and exportable(obj)]
+    return exportObjects(objects, workers, force)
+
+def report(results):
+    if not results:
+        return
+    width = max(len(r[0]) for r in results)
+    lines = ["{0:<{w}}  {1:>10}  {2:>8}  {3:>10}".format("Object", "Facets", "Seconds", "Mode", w=width)]
+    for label, name, mode, facets, seconds in results:
+        if facets is None:
+            lines.append("{0:<{w}}  {1:>10}  {2:>8}  {3:>10}".format(label, "", "", mode, w=width))
+        else:
+            lines.append("{0:<{w}}  {1:>10}  {2:>8.3f}  {3:>10}".format(label, facets, seconds, mode, w=width))
+    total = sum(r[4] for r in results if r[4] is not None)
+    lines.append("{0} file(s), {1:.3f} s of meshing and writing".format(len(results), total))
+    App.Console.PrintMessage("\n".join(lines) + "\n")
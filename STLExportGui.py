@@ -1,47 +1,31 @@
 import FreeCADGui
 import FreeCAD as App
-import os, math
-import Mesh, MeshPart
+import os
+
+import STLExport
+import ThreeMFExport
 
 def exportStl():
-    degrees = 3
-    millimeters = 0.1
-    angl = degrees * math.pi/180
-    
     sel = FreeCADGui.Selection.getSelection()
-    numsel = len(sel)
-
-    if numsel != 1:
-        App.Console.PrintError("Cannot export to STL with multiple objects selected")
-        return
 
-    toExport = sel[0]
-
-    if toExport.Document.FileName=="":
-        App.Console.PrintError("Cannot export from unsaved document")
+    if len(sel) == 0:
+        App.Console.PrintError("Select the objects to export to STL\n")
         return
 
-    _dir, _name = os.path.split(toExport.Document.FileName)
-    meshName = "{}-{}.stl".format(toExport.Document.Name, toExport.Label)
-    meshName = os.path.join(_dir, meshName)
-
-    shape = toExport.Shape
-    mesh = MeshPart.meshFromShape(Shape=shape, LinearDeflection=millimeters, AngularDeflection=angl, Relative=False)
-    mesh.write(Filename=meshName)
-    App.Console.PrintMessage("STL file generated at {}".format(meshName))
+    STLExport.exportObjects(sel)
 
 
 class STLExportCommand:
 
     def GetResources(self):
-        return { "MenuText": "Export selected object as STL",
-                 "ToolTip": "Export selected object as STL",
+        return { "MenuText": "Export selected objects as STL",
+                 "ToolTip": "Export every selected object as its own STL file",
                  "Pixmap": os.path.join(os.path.dirname(__file__),"3d-printer.svg")}
 
     def IsActive(self):
         if App.ActiveDocument == None:
             return False
-        elif len(FreeCADGui.Selection.getSelection()) == 1:
+        elif len(FreeCADGui.Selection.getSelection()) > 0:
             return True
         else:
             return False
@@ -49,6 +33,34 @@ class STLExportCommand:
     def Activated(self):
         exportStl()
 
+class STLDocumentExportCommand:
+
+    def GetResources(self):
+        return { "MenuText": "Export document as STL",
+                 "ToolTip": "Export every visible object of the active document as its own STL file",
+                 "Pixmap": os.path.join(os.path.dirname(__file__),"3d-printer.svg")}
+
+    def IsActive(self):
+        return App.ActiveDocument != None
+
+    def Activated(self):
+        STLExport.exportDocuments([App.ActiveDocument])
+
+class ThreeMFExportCommand:
+
+    def GetResources(self):
+        return { "MenuText": "Export selected objects as 3MF",
+                 "ToolTip": "Export the selected objects into one 3MF package, writing repeated meshes only once",
+                 "Pixmap": os.path.join(os.path.dirname(__file__),"3d-printer.svg")}
+
+    def IsActive(self):
+        return App.ActiveDocument != None and len(FreeCADGui.Selection.getSelection()) > 0
+
+    def Activated(self):
+        ThreeMFExport.exportObjects(FreeCADGui.Selection.getSelection())
+
 FreeCADGui.addCommand('STL', STLExportCommand())
+FreeCADGui.addCommand('STLDocument', STLDocumentExportCommand())
+FreeCADGui.addCommand('3MF', ThreeMFExportCommand())
 
-toolbar = ( "STL", [ 'STL', ])
\ No newline at end of file
+toolbar = ( "STL", [ 'STL', 'STLDocument', '3MF', ])
@@ -0,0 +1,49 @@
+"""
+Binary STL writer for triangle meshes given as NumPy arrays.
+
+Objects that already consist of planar triangles can be written straight
+from their vertex and triangle-index arrays, without tessellating an OCC
+shape first. Does not need FreeCAD.
+"""
+import numpy as np
+
+facetdtype = np.dtype([('normal', '<f4', (3,)),
+                       ('vertices', '<f4', (3, 3)),
+                       ('attribute', '<u2')])
+
+chunksize = 1 << 20
+
+def normals(vertices, triangles):
+    a = vertices[triangles[:, 0]]
+    n = np.cross(vertices[triangles[:, 1]] - a, vertices[triangles[:, 2]] - a)
+    length = np.linalg.norm(n, axis=1)
+    # Degenerate triangles get a zero normal instead of NaN
+    np.divide(n, length[:, None], out=n, where=length[:, None] > 0)
+    return n
+
+def writeStl(filename, vertices, triangles, header=b"myfreecadmodule"):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.intp)
+    count = len(triangles)
+
+    with open(filename, "wb") as f:
+        f.write(header[:80].ljust(80, b" "))
+        f.write(np.uint32(count).tobytes())
+        f.truncate(84 + count*facetdtype.itemsize)
+
+    if count == 0:
+        return
+
+    facets = np.memmap(filename, dtype=facetdtype, mode="r+", offset=84, shape=(count,))
+    for start in range(0, count, chunksize):
+        chunk = triangles[start:start+chunksize]
+        facets['normal'][start:start+len(chunk)] = normals(vertices, chunk)
+        facets['vertices'][start:start+len(chunk)] = vertices[chunk]
+    facets['attribute'] = 0
+    facets.flush()
+    del facets
+
+def transform(vertices, matrix):
+    # matrix is a 4x4 homogeneous transformation, e.g. from a Placement
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(4, 4)
+    return vertices @ matrix[:3, :3].T + matrix[:3, 3]
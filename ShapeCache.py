@@ -0,0 +1,139 @@
+import FreeCAD
+import Part
+import os, hashlib, json, tempfile
+from collections import OrderedDict
+
+# Bump when the geometry of the features changes, so old entries are not reused
+cacheversion = 5
+
+def preferences():
+    return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Mark/ShapeCache")
+
+def shapekey(kind, parameters):
+    canonical = json.dumps([cacheversion, kind, parameters], sort_keys=True)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    "Least recently used cache, bounded in items or in the total of sizeof(value)"
+
+    def __init__(self, maxsize=32, sizeof=None):
+        self.maxsize = maxsize
+        self.sizeof = sizeof or (lambda value: 1)
+        self.entries = OrderedDict()
+        self.total = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key, value):
+        self.discard(key)
+        size = self.sizeof(value)
+        self.entries[key] = (value, size)
+        self.total += size
+        while self.total > self.maxsize and len(self.entries) > 1:
+            _, (_, oldsize) = self.entries.popitem(last=False)
+            self.total -= oldsize
+
+    def discard(self, key):
+        if key in self.entries:
+            _, size = self.entries.pop(key)
+            self.total -= size
+
+    def clear(self):
+        self.entries.clear()
+        self.total = 0
+
+
+class ShapeCache:
+    "Shapes in an in-memory LRU, backed by BREP files with size-based eviction"
+
+    def __init__(self, directory, memoryitems=32, disksize=256*1024*1024):
+        self.directory = directory
+        self.disksize = disksize
+        self.memory = LRUCache(memoryitems)
+
+    def filename(self, key):
+        return os.path.join(self.directory, key + ".brep")
+
+    def get(self, key):
+        shape = self.memory.get(key)
+        if shape is not None:
+            return shape
+
+        filename = self.filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            shape = Part.Shape()
+            shape.importBrep(filename)
+            os.utime(filename)
+        except Exception as e:
+            FreeCAD.Console.PrintWarning("Ignoring unreadable cache file {0}: {1}\n".format(filename, e))
+            return None
+
+        self.memory.put(key, shape)
+        return shape
+
+    def put(self, key, shape):
+        self.memory.put(key, shape)
+        if self.disksize <= 0:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first, other processes may read the cache
+            fd, tmp = tempfile.mkstemp(suffix=".brep", dir=self.directory)
+            os.close(fd)
+            shape.exportBrep(tmp)
+            os.replace(tmp, self.filename(key))
+        except Exception as e:
+            FreeCAD.Console.PrintWarning("Could not write shape cache: {0}\n".format(e))
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".brep"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in sorted(entries):
+            if total <= self.disksize:
+                break
+            try:
+                os.remove(filename)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        self.memory.clear()
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".brep"):
+                    os.remove(entry.path)
+
+
+_cache = None
+
+def cache():
+    global _cache
+    if _cache is None:
+        p = preferences()
+        base = getattr(FreeCAD, "getUserCachePath", FreeCAD.getUserAppDataDir)()
+        _cache = ShapeCache(os.path.join(base, "Mark", "shapes"),
+                            memoryitems=p.GetInt("MemoryItems", 32),
+                            disksize=p.GetInt("DiskMegabytes", 256)*1024*1024)
+    return _cache
@@ -0,0 +1,89 @@
+"""
+3MF export of one or many objects into a single package.
+
+Meshes are written once and reused: objects whose proxy describes itself
+as instanced parts (a components() method, like the frames of the platonic
+solids) become components referring to one strut and one node mesh, and
+objects with the same local geometry (copies of a decorated cylinder, say)
+share one mesh resource and only differ in the transform of their build
+item. Everything else is tessellated like for STL.
+"""
+import FreeCAD as App
+import os, time
+from concurrent.futures import ThreadPoolExecutor
+
+import STLExport
+import LazyShape
+import ThreeMFWriter
+
+def filename(objects):
+    doc = objects[0].Document
+    _dir = os.path.dirname(doc.FileName)
+    if len(objects) == 1:
+        return os.path.join(_dir, "{}-{}.3mf".format(doc.Name, objects[0].Label))
+    return os.path.join(_dir, "{}.3mf".format(doc.Name))
+
+def localshape(obj):
+    # The shape without its placement, so copies tessellate to the same mesh
+    shape = LazyShape.ensureshape(obj).copy()
+    placement = shape.Placement
+    shape.Placement = App.Placement()
+    return shape, placement.toMatrix().A
+
+def tessellation(brep, linear, angular, workers):
+    # Runs in the thread pool, which waits for the worker processes
+    key = (STLExport.fingerprint(None, brep), linear, angular)
+    return key, STLExport.tessellate(brep, key, linear, angular, workers)
+
+def exportObjects(objects, name=None, workers=0):
+    objects = [obj for obj in objects if STLExport.exportable(obj)]
+    if not objects:
+        App.Console.PrintError("Nothing to export to 3MF\n")
+        return None
+    if objects[0].Document.FileName == "" and name is None:
+        App.Console.PrintError("Cannot export from unsaved document\n")
+        return None
+
+    name = name or filename(objects)
+    workers = workers or STLExport.preferences().GetInt("Workers", 0) or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    with ThreeMFWriter.Package(name) as package, ThreadPoolExecutor(max_workers=workers) as pool:
+        tessellations = []
+        for obj in objects:
+            proxy = getattr(obj, "Proxy", None)
+            linear, angular = STLExport.deflection(obj)
+
+            parts = proxy.components(obj, linear, angular) if hasattr(proxy, "components") else None
+            if parts is not None:
+                ids = [(package.resource(key) or package.mesh(*build(), key=key), matrices)
+                       for key, build, matrices in parts]
+                id = package.components([(id, m) for id, matrices in ids for m in matrices], name=obj.Label)
+                package.item(id, obj.Placement.toMatrix().A)
+                continue
+
+            data = proxy.mesh(obj) if hasattr(proxy, "mesh") else None
+            if data is not None:
+                key = ("mesh", STLExport.fingerprint(data, None))
+                package.item(package.mesh(*data, key=key, name=obj.Label), obj.Placement.toMatrix().A)
+                continue
+
+            # Everything that reads the document happens here, on the main thread.
+            # The deflection follows the size of the shape, which may only
+            # exist now.
+            shape, matrix = localshape(obj)
+            linear, angular = STLExport.deflection(obj)
+            tessellations.append((obj.Label, matrix, pool.submit(tessellation, shape.exportBrepToString(), linear, angular, workers)))
+
+        # Written in order, so the package does not depend on which mesh was done first
+        for label, matrix, future in tessellations:
+            try:
+                key, data = future.result()
+            except Exception as e:
+                App.Console.PrintError("3MF export of {0} failed: {1}\n".format(label, e))
+                continue
+            package.item(package.mesh(*data, key=key, name=label), matrix)
+
+    App.Console.PrintMessage("3MF file generated at {0}: {1} object(s), {2} mesh(es), {3} triangles in {4:.3f} s\n".format(
+        name, len(package.items), len(package.ids), package.triangles, time.perf_counter() - start))
+    return name
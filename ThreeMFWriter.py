@@ -0,0 +1,128 @@
+"""
+3MF writer for triangle meshes given as NumPy arrays.
+
+Every distinct mesh is written once as a resource; repeats are components
+that refer to it with a transform. The model file is streamed into the
+archive while the resources are added, so only the small build section is
+kept in memory. Does not need FreeCAD.
+
+    with Package("plate.3mf") as package:
+        strut = package.mesh(vertices, triangles, key="strut")
+        frame = package.components([(strut, m) for m in matrices])
+        package.item(frame)
+"""
+import numpy as np
+import zipfile
+from xml.sax.saxutils import quoteattr
+
+contenttypes = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+                '</Types>\n')
+
+relationships = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+                 'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+                 '</Relationships>\n')
+
+chunksize = 1 << 16
+
+def transform(matrix):
+    # 3MF uses row vectors: the 3 x 3 rotation is transposed and the
+    # translation is the last row
+    m = np.asarray(matrix, dtype=np.float64).reshape(4, 4)
+    return " ".join("{0:.9g}".format(v) for v in np.vstack([m[:3, :3].T, m[:3, 3]]).ravel())
+
+def isidentity(matrix):
+    return matrix is None or np.allclose(np.asarray(matrix, dtype=np.float64).reshape(4, 4), np.eye(4))
+
+
+class Package:
+    def __init__(self, filename, unit="millimeter"):
+        self.archive = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED)
+        self.archive.writestr("[Content_Types].xml", contenttypes)
+        self.archive.writestr("_rels/.rels", relationships)
+        self.model = self.archive.open("3D/3dmodel.model", "w", force_zip64=True)
+        self.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                   '<model unit="{0}" xml:lang="en-US" '
+                   'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+                   '<resources>\n'.format(unit))
+        self.ids = {}
+        self.items = []
+        self.count = 0
+        self.triangles = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, text):
+        self.model.write(text.encode("utf-8"))
+
+    def newid(self, key):
+        self.count += 1
+        if key is not None:
+            self.ids[key] = self.count
+        return self.count
+
+    def resource(self, key):
+        "Id of the resource written for key, or None"
+        return self.ids.get(key)
+
+    def mesh(self, vertices, triangles, key=None, name=None):
+        "Write a mesh resource once per key and return its id"
+        if key is not None and key in self.ids:
+            return self.ids[key]
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        id = self.newid(key)
+
+        self.write('<object id="{0}" type="model"{1}>\n<mesh>\n<vertices>\n'.format(
+            id, " name={0}".format(quoteattr(name)) if name else ""))
+        for start in range(0, len(vertices), chunksize):
+            chunk = vertices[start:start+chunksize]
+            self.write(('<vertex x="%.9g" y="%.9g" z="%.9g"/>\n'*len(chunk)) % tuple(chunk.ravel()))
+        self.write('</vertices>\n<triangles>\n')
+        for start in range(0, len(triangles), chunksize):
+            chunk = triangles[start:start+chunksize]
+            self.write(('<triangle v1="%d" v2="%d" v3="%d"/>\n'*len(chunk)) % tuple(chunk.ravel().tolist()))
+        self.write('</triangles>\n</mesh>\n</object>\n')
+        self.triangles += len(triangles)
+        return id
+
+    def components(self, parts, key=None, name=None):
+        "Object made of (resource id, 4 x 4 matrix or None) parts"
+        if key is not None and key in self.ids:
+            return self.ids[key]
+        id = self.newid(key)
+        self.write('<object id="{0}" type="model"{1}>\n<components>\n'.format(
+            id, " name={0}".format(quoteattr(name)) if name else ""))
+        for objectid, matrix in parts:
+            if isidentity(matrix):
+                self.write('<component objectid="{0}"/>\n'.format(objectid))
+            else:
+                self.write('<component objectid="{0}" transform="{1}"/>\n'.format(objectid, transform(matrix)))
+        self.write('</components>\n</object>\n')
+        return id
+
+    def item(self, objectid, matrix=None):
+        "Put a resource on the build plate"
+        self.items.append((objectid, None if isidentity(matrix) else transform(matrix)))
+
+    def close(self):
+        if self.model is None:
+            return
+        self.write('</resources>\n<build>\n')
+        for objectid, matrix in self.items:
+            if matrix is None:
+                self.write('<item objectid="{0}"/>\n'.format(objectid))
+            else:
+                self.write('<item objectid="{0}" transform="{1}"/>\n'.format(objectid, matrix))
+        self.write('</build>\n</model>\n')
+        self.model.close()
+        self.model = None
+        self.archive.close()
@@ -0,0 +1,90 @@
+"""
+Process pool shared by the geometry builders.
+
+Shapes are exchanged with the workers as BREP strings. When no pool can be
+started (or it breaks) the callers fall back to doing the work serially. A
+pool that could not be started is not tried again in this session. The
+pools are shared between threads, e.g. those of the STL export.
+"""
+import os, sys, threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_pools = {}
+_failed = False
+_lock = threading.Lock()
+
+def workercount(workers):
+    if _failed:
+        return 1
+    if not workers or workers < 0:
+        return os.cpu_count() or 1
+    return workers
+
+def interpreter():
+    # Inside FreeCAD sys.executable is the FreeCAD binary, which cannot be
+    # used to spawn plain Python workers
+    name = os.path.basename(sys.executable).lower()
+    if not name.startswith("freecad"):
+        return sys.executable
+    for candidate in [os.path.join(sys.prefix, "bin", "python3"),
+                      os.path.join(sys.prefix, "bin", "python"),
+                      os.path.join(sys.prefix, "python.exe"),
+                      os.path.join(os.path.dirname(sys.executable), "python.exe"),
+                      os.path.join(os.path.dirname(sys.executable), "python3")]:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def initworker(paths):
+    for p in reversed(paths):
+        if p not in sys.path:
+            sys.path.insert(0, p)
+
+def pool(workers):
+    workers = workercount(workers)
+    with _lock:
+        if workers not in _pools:
+            python = interpreter()
+            if python is None:
+                raise OSError("No Python interpreter found to start workers")
+            context = multiprocessing.get_context("spawn")
+            context.set_executable(python)
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                  mp_context=context,
+                                                  initializer=initworker,
+                                                  initargs=(list(sys.path),))
+        return _pools[workers]
+
+def discard(executor):
+    with _lock:
+        for workers, e in list(_pools.items()):
+            if e is executor:
+                del _pools[workers]
+    executor.shutdown(wait=False)
+
+def shutdown():
+    with _lock:
+        executors = list(_pools.values())
+        _pools.clear()
+    for executor in executors:
+        executor.shutdown(wait=False)
+
+def parallelmap(function, items, workers):
+    "Map over a process pool; raises if the pool cannot be used"
+    global _failed
+    try:
+        executor = pool(workers)
+    except OSError:
+        # No interpreter to start workers with: run serially from now on
+        _failed = True
+        raise
+    try:
+        return list(executor.map(function, items))
+    except BrokenProcessPool:
+        # The workers died and the pool cannot be used again; other threads
+        # using it get the same error. Run serially from now on.
+        _failed = True
+        discard(executor)
+        raise
@@ -0,0 +1,204 @@
+"""
+Benchmarks for geometry generation and export.
+
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --compare baseline.json
+
+Runs against FreeCAD when it can be imported (set FREECAD_LIB to the
+directory holding FreeCAD.so/FreeCAD.pyd if it is not on the path).
+Otherwise the stand-ins in benchmarks/stubs are used, which still measure
+the pure-Python overhead of the builders. Results of the two backends are
+not comparable; --compare warns when they differ.
+"""
+import argparse, json, os, sys, tempfile, time, statistics, platform
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(here))
+
+def loadbackend(stub):
+    if not stub:
+        if os.environ.get("FREECAD_LIB"):
+            sys.path.append(os.environ["FREECAD_LIB"])
+        try:
+            import FreeCAD
+            return "freecad"
+        except ImportError:
+            pass
+    sys.path.insert(0, os.path.join(here, "stubs"))
+    return "stub"
+
+
+class Length(float):
+    "Float that also answers .Value, like a FreeCAD quantity"
+
+    @property
+    def Value(self):
+        return float(self)
+
+class Properties:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def cylinderproperties(segments, stripes):
+    return Properties(Radius=Length(20.0), Thickness=Length(2.0), Height=Length(50.0),
+                      Segments=segments, Stripes=stripes, Reversed=False, Refine=False, Workers=1)
+
+def measure(function, mintime=0.2, maxrepeat=20):
+    # Repeat cheap benchmarks until they ran for at least mintime
+    times = []
+    while len(times) < maxrepeat and (not times or sum(times) < mintime):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return { 'min': min(times), 'median': statistics.median(times), 'runs': len(times) }
+
+def write3mf(filename, parts):
+    # Every part is (mesh, placements); repeats become components
+    import ThreeMFWriter
+    with ThreeMFWriter.Package(filename) as package:
+        ids = [(package.mesh(*data), matrices) for data, matrices in parts]
+        package.item(package.components([(id, m) for id, matrices in ids for m in matrices]))
+
+def matricize(faces):
+    # Adjacency matrix the frames were built from before the topology
+    # tables, kept as the reference for faceedges
+    matrix = np.zeros((max(i for f in faces for i in f) + 1,)*2, dtype=bool)
+    for f in faces:
+        for a, b in zip(f, f[1:] + f[:1]):
+            matrix[a][b] = matrix[b][a] = True
+    return matrix
+
+def benchmarks(quick):
+    import DecoratedGeometry, DecoratedObjects
+    import PlatonicGeometry, PlatonicSolidObject
+    import FuseEngine, STLWriter, STLExport
+
+    segments = (36, 180) if quick else (36, 180, 720)
+    stripes = (5, 20) if quick else (5, 50, 200)
+    outdir = tempfile.mkdtemp(prefix="bench")
+
+    cylinder = DecoratedObjects.DecoratedCylinder.__new__(DecoratedObjects.DecoratedCylinder)
+    for n in segments:
+        yield "layerpoints/{0}".format(n), lambda: DecoratedGeometry.layerpoints(n, 20.0)
+        for s in stripes:
+            props = cylinderproperties(n, s)
+            name = "{0}x{1}".format(n, s)
+            yield "cylindermesh/" + name, lambda: DecoratedGeometry.cylindermesh(20.0, 2.0, 50.0, n, s)
+            yield "cylinderfaces/" + name, lambda: cylinder.cylinderfaces(props, 20.0)
+            yield "cylinderbuild/" + name, lambda: cylinder.build(props)
+            params = cylinder.parameters(props)
+            yield "cylinderserial/" + name, lambda: DecoratedObjects.buildshape(params, 1)
+            yield "cylinderparallel/" + name, lambda: DecoratedObjects.buildshape(params, 0)
+            yield "massproperties/cylinder/" + name, lambda: DecoratedObjects.massproperties(params)
+
+            data = DecoratedGeometry.cylindermesh(20.0, 2.0, 50.0, n, s)
+            filename = os.path.join(outdir, name + ".stl")
+            yield "writestl/" + name, lambda: STLWriter.writeStl(filename, *data)
+            yield "exportstl/" + name, lambda: STLExport.writefile(filename, data, None, 0.1, 0.05, force=True)
+            yield "write3mf/" + name, lambda: write3mf(filename[:-4] + ".3mf", [(data, [None])])
+
+    for solid in PlatonicGeometry.platonic_solids:
+        faces = PlatonicGeometry.platonic_solids[solid]['faces']
+        yield "matricize/" + solid, lambda: matricize(faces)
+        yield "cylindershapes/" + solid, lambda: PlatonicSolidObject.cylindershapes(solid, 10.0, 1.0)
+
+        shapes = PlatonicSolidObject.cylindershapes(solid, 10.0, 1.0) + PlatonicSolidObject.sphereshapes(solid, 10.0, 1.0)
+        yield "fuse/" + solid, lambda: FuseEngine.fuse(shapes, 1)
+
+        filename = os.path.join(outdir, solid + ".stl")
+        frame = FuseEngine.fuse(shapes, 1)
+        yield "exportstl/frame/" + solid, lambda: STLExport.writefile(filename, None, frame.exportBrepToString(), 0.1, 0.05, force=True, workers=1)
+
+        struts, nodes = PlatonicGeometry.frameinstances(solid, 10.0)
+        parts = [(PlatonicGeometry.strutmesh(1.0, length, 32), m) for length, m in struts.items()]
+        parts.append((PlatonicGeometry.spheremesh(1.0, 32), nodes))
+        yield "write3mf/frame/" + solid, lambda: write3mf(filename[:-4] + ".3mf", parts)
+
+        params = { 'Solid': solid, 'SolidObject': False, 'ActiveMeasure': "Outer radius", 'Size': 10.0,
+                   'EdgeRadius': 1.0, 'Fuse': True, 'Refine': False, 'Points': [], 'Frequency': 1 }
+        yield "massproperties/frame/" + solid, lambda: PlatonicSolidObject.massproperties(params)
+
+    def geodesic(solid, frequency):
+        # Without the cache, which would answer every repeat
+        PlatonicGeometry._geodesic.cache_clear()
+        return PlatonicGeometry.geodesic(solid, frequency)
+
+    for solid in ("Octahedron", "Icosahedron"):
+        for f in ((4, 50) if quick else (4, 50, 100)):
+            yield "geodesic/{0}/{1}".format(solid, f), lambda: geodesic(solid, f)
+        sphere = PlatonicGeometry.geodesic(solid, 8)
+        yield "solidshape/geodesic/" + solid, lambda: PlatonicSolidObject.solidshape(sphere, 10.0)
+
+    import ConvexHull
+    for n in ((1000,) if quick else (1000, 5000, 20000)):
+        points = np.random.default_rng(n).normal(size=(n, 3))
+        sphere = points / np.linalg.norm(points, axis=1)[:, None]
+        yield "convexhull/cloud/{0}".format(n), lambda: ConvexHull.convexhull(points)
+        yield "convexhull/sphere/{0}".format(n), lambda: ConvexHull.polyhedron(sphere)
+
+    import LatticeGeometry, LatticeObject
+    for cell in LatticeGeometry.cells:
+        for n in ((5, 10) if quick else (5, 10, 20)):
+            name = "{0}/{1}x{1}x{1}".format(cell, n)
+            params = { 'Cell': cell, 'Pitch': 10.0, 'StrutRadius': 1.0, 'Counts': [n, n, n] }
+            yield "lattice/" + name, lambda: LatticeGeometry.lattice(cell, 10.0, (n, n, n))
+            yield "latticebuild/" + name, lambda: LatticeObject.buildshape(params)
+
+def run(quick, select):
+    results = {}
+    for name, function in benchmarks(quick):
+        if select and not any(s in name for s in select):
+            continue
+        results[name] = measure(function)
+        print("{0:<36} {1:10.6f} s".format(name, results[name]['median']))
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print("\n{0:<36} {1:>10} {2:>10} {3:>7}".format("Benchmark", "Baseline", "Current", "Ratio"))
+    for name in sorted(set(results) & set(baseline)):
+        old, new = baseline[name]['median'], results[name]['median']
+        ratio = new/old if old > 0 else float("inf")
+        # Ignore noise on sub-millisecond benchmarks
+        slower = ratio > 1 + threshold and new - old > 1e-3
+        if slower:
+            regressions.append(name)
+        print("{0:<36} {1:10.6f} {2:10.6f} {3:7.2f}{4}".format(name, old, new, ratio, "  SLOWER" if slower else ""))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--quick", action="store_true", help="smaller Segments x Stripes grid")
+    parser.add_argument("--stub", action="store_true", help="use the stand-ins even when FreeCAD is available")
+    parser.add_argument("select", nargs="*", help="only run benchmarks whose name contains one of these")
+    args = parser.parse_args()
+
+    backend = loadbackend(args.stub)
+    print("Backend: {0}".format(backend))
+    results = run(args.quick, args.select)
+
+    report = { 'backend': backend,
+               'python': platform.python_version(),
+               'machine': platform.machine(),
+               'results': results }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('backend') != backend:
+            print("Warning: baseline was measured with backend {0}".format(baseline.get('backend')))
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print("\n{0} benchmark(s) slower than the baseline".format(len(regressions)))
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
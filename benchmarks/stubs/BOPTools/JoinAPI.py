@@ -0,0 +1,4 @@
+import Part
+
+def connect(shapes, tolerance=0.0):
+    return Part.Solid(Part.Shell(shapes))
@@ -0,0 +1,265 @@
+"""
+Minimal stand-in for the FreeCAD module, used by the benchmarks and the tests
+when FreeCAD itself cannot be imported. It only does enough to let the
+geometry code run, so the timings measure the pure-Python overhead around
+OCC. Documents hold feature objects with typed properties, which follow the
+rules of Part::Feature and Mesh::Feature for the Shape, Mesh and Placement.
+"""
+import math, tempfile
+
+GuiUp = False
+
+
+class Vector:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, (tuple, list, Vector)):
+            x, y, z = x
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __add__(self, other):
+        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, factor):
+        return Vector(self.x*factor, self.y*factor, self.z*factor)
+
+    @property
+    def Length(self):
+        return math.sqrt(self.x*self.x + self.y*self.y + self.z*self.z)
+
+
+class Rotation:
+    def __init__(self, *args):
+        self.Q = tuple(args) if len(args) == 4 else (0.0, 0.0, 0.0, 1.0)
+
+
+class Matrix:
+    def __init__(self):
+        self.A = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+    def scale(self, *args):
+        x, y, z = args[0] if len(args) == 1 else args
+        self.A[0] *= x
+        self.A[5] *= y
+        self.A[10] *= z
+
+
+class Placement:
+    def __init__(self, base=None, rotation=None):
+        self.Base = base or Vector()
+        self.Rotation = rotation or Rotation()
+
+    def isIdentity(self):
+        return tuple(self.Base) == (0.0, 0.0, 0.0) and self.Rotation.Q == (0.0, 0.0, 0.0, 1.0)
+
+    def toMatrix(self):
+        m = Matrix()
+        m.A[3], m.A[7], m.A[11] = self.Base
+        return m
+
+
+class _Console:
+    def PrintMessage(self, text):
+        pass
+
+    PrintLog = PrintWarning = PrintError = PrintMessage
+
+Console = _Console()
+
+
+class _Parameters:
+    def GetInt(self, name, default=0):
+        return default
+
+    def GetFloat(self, name, default=0.0):
+        return default
+
+    def GetBool(self, name, default=False):
+        return default
+
+    def GetString(self, name, default=""):
+        return default
+
+def ParamGet(path):
+    return _Parameters()
+
+_userdir = tempfile.mkdtemp(prefix="freecadstub")
+
+def getUserAppDataDir():
+    return _userdir
+
+def getUserCachePath():
+    return _userdir
+
+class Quantity(float):
+    "Float that also answers .Value, like the value of a length property"
+
+    @property
+    def Value(self):
+        return float(self)
+
+
+defaults = { "App::PropertyBool": False,
+             "App::PropertyInteger": 0,
+             "App::PropertyFloat": 0.0,
+             "App::PropertyLength": Quantity(0.0),
+             "App::PropertyAngle": Quantity(0.0),
+             "App::PropertyString": "",
+             "App::PropertyVectorList": [],
+             "App::PropertyEnumeration": None }
+
+class DocumentObject:
+    def __init__(self, document, kind, name):
+        self.__dict__.update(Document=document, TypeId=kind, Name=name, Label=name, Proxy=None,
+                             Visibility=True, InList=[], OutList=[], Placement=Placement(),
+                             properties={}, enumerations={}, status={}, touched=True, recomputing=False)
+        if self.isDerivedFrom("Mesh::Feature"):
+            import Mesh
+            self.__dict__["Mesh"] = Mesh.Mesh()
+        else:
+            import Part
+            self.__dict__["Shape"] = Part.Shape()
+
+    def isDerivedFrom(self, kind):
+        return self.TypeId.split("::")[0] == kind.split("::")[0]
+
+    def addProperty(self, kind, name, group="", doc=""):
+        self.properties[name] = kind
+        self.__dict__[name] = defaults.get(kind)
+        return self
+
+    def getEnumerationsOfProperty(self, name):
+        return list(self.enumerations.get(name, []))
+
+    def setEditorMode(self, name, mode):
+        pass
+
+    def setPropertyStatus(self, name, status):
+        self.status[name] = status
+
+    def __setattr__(self, name, value):
+        kind = self.properties.get(name)
+        output = "Mesh" if self.isDerivedFrom("Mesh::Feature") else "Shape"
+        if kind == "App::PropertyEnumeration":
+            if isinstance(value, list):
+                self.enumerations[name] = list(value)
+                value = self.__dict__[name] if self.__dict__[name] in value else value[0]
+            elif isinstance(value, int):
+                value = self.enumerations[name][value]
+            elif value not in self.enumerations[name]:
+                raise ValueError("{0!r} is not part of the enumeration".format(value))
+        elif kind in ("App::PropertyLength", "App::PropertyAngle"):
+            value = Quantity(value)
+        elif kind == "App::PropertyInteger":
+            value = int(value)
+        elif kind == "App::PropertyVectorList":
+            value = [Vector(v) for v in value]
+        elif name == output:
+            value = value.copy()
+            if self.recomputing and output == "Shape":
+                value.Placement = self.Placement
+            else:
+                # Outside a recompute a Part feature takes the placement of
+                # the shape, a Mesh feature always does
+                self.__dict__["Placement"] = value.Placement
+        elif name == "Placement":
+            getattr(self, output).Placement = value
+
+        self.__dict__[name] = value
+        if name in self.properties or name == "Placement":
+            self.touch()
+        if self.Proxy is not None and hasattr(self.Proxy, "onChanged") and name != "Proxy":
+            self.Proxy.onChanged(self, name)
+
+    @property
+    def InListRecursive(self):
+        found = {}
+        for obj in self.InList:
+            found[obj.Name] = obj
+            found.update((o.Name, o) for o in obj.InListRecursive)
+        return list(found.values())
+
+    def touch(self):
+        self.__dict__["touched"] = True
+
+    def isTouched(self):
+        return self.touched
+
+    def recompute(self):
+        self.__dict__["recomputing"] = True
+        try:
+            self.Proxy.execute(self)
+        finally:
+            self.__dict__["recomputing"] = False
+        self.__dict__["touched"] = False
+        return True
+
+
+class Document:
+    def __init__(self, name):
+        self.Name = name
+        self.FileName = ""
+        self.Objects = []
+        # What every recompute() was asked for, None for the whole document
+        self.recomputes = []
+
+    def addObject(self, kind, name):
+        names = {obj.Name for obj in self.Objects}
+        unique, count = name, 0
+        while unique in names:
+            count += 1
+            unique = "{0}{1:03d}".format(name, count)
+        obj = DocumentObject(self, kind, unique)
+        self.Objects.append(obj)
+        return obj
+
+    def getObject(self, name):
+        return next((obj for obj in self.Objects if obj.Name == name), None)
+
+    def removeObject(self, name):
+        self.Objects = [obj for obj in self.Objects if obj.Name != name]
+
+    def recompute(self, objs=None):
+        self.recomputes.append(None if objs is None else sorted(obj.Name for obj in objs))
+        touched = [obj for obj in (self.Objects if objs is None else objs) if obj.isTouched()]
+        for obj in touched:
+            obj.recompute()
+        return len(touched)
+
+    def openTransaction(self, name=""):
+        pass
+
+    def commitTransaction(self):
+        pass
+
+    def abortTransaction(self):
+        pass
+
+
+_documents = {}
+ActiveDocument = None
+
+def newDocument(name="Unnamed"):
+    global ActiveDocument
+    unique, count = name, 0
+    while unique in _documents:
+        count += 1
+        unique = "{0}{1}".format(name, count)
+    ActiveDocument = _documents[unique] = Document(unique)
+    return ActiveDocument
+
+def closeDocument(name):
+    global ActiveDocument
+    doc = _documents.pop(name)
+    if ActiveDocument is doc:
+        ActiveDocument = None
+
+def listDocuments():
+    return dict(_documents)
@@ -0,0 +1,34 @@
+"""
+Minimal stand-in for FreeCAD's Mesh module, see FreeCAD.py next to it.
+"""
+from FreeCAD import Vector, Placement
+
+
+class Mesh:
+    def __init__(self):
+        self.Points = []
+        self.Facets = []
+        self.Placement = Placement()
+
+    @property
+    def CountPoints(self):
+        return len(self.Points)
+
+    @property
+    def CountFacets(self):
+        return len(self.Facets)
+
+    @property
+    def Topology(self):
+        return self.Points, self.Facets
+
+    def addFacets(self, data):
+        vertices, triangles = data
+        offset = len(self.Points)
+        self.Points.extend(Vector(*p) for p in vertices)
+        self.Facets.extend(tuple(offset + i for i in t) for t in triangles)
+
+    def copy(self):
+        mesh = Mesh()
+        mesh.Points, mesh.Facets, mesh.Placement = list(self.Points), list(self.Facets), self.Placement
+        return mesh
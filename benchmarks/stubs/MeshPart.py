@@ -0,0 +1,11 @@
+class _Mesh:
+    def __init__(self, shape):
+        self.CountFacets = len(shape.allpoints())
+        self.Topology = ([tuple(p) for p in shape.allpoints()], [])
+
+    def write(self, Filename):
+        with open(Filename, "wb") as f:
+            f.write(b"\0"*84)
+
+def meshFromShape(Shape, **kwargs):
+    return _Mesh(Shape)
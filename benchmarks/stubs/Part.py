@@ -0,0 +1,140 @@
+"""
+Minimal stand-in for FreeCAD's Part module, see FreeCAD.py next to it.
+Shapes only remember their children and points.
+"""
+from FreeCAD import Vector, Placement
+
+
+class BoundBox:
+    def __init__(self, points):
+        xs, ys, zs = zip(*points) if points else ((0.0,), (0.0,), (0.0,))
+        self.XMin, self.XMax = min(xs), max(xs)
+        self.YMin, self.YMax = min(ys), max(ys)
+        self.ZMin, self.ZMax = min(zs), max(zs)
+
+    @property
+    def Center(self):
+        return Vector((self.XMin + self.XMax)/2, (self.YMin + self.YMax)/2, (self.ZMin + self.ZMax)/2)
+
+    @property
+    def DiagonalLength(self):
+        return (Vector(self.XMax, self.YMax, self.ZMax) - Vector(self.XMin, self.YMin, self.ZMin)).Length
+
+
+class Shape:
+    def __init__(self, children=(), points=()):
+        self.children = list(children)
+        self.points = list(points)
+        self.Placement = Placement()
+
+    def allpoints(self):
+        points = list(self.points)
+        for c in self.children:
+            points.extend(c.allpoints())
+        return points
+
+    @property
+    def BoundBox(self):
+        return BoundBox([tuple(p) for p in self.allpoints()])
+
+    @property
+    def Faces(self):
+        if isinstance(self, Face):
+            return [self]
+        return [f for c in self.children for f in c.Faces]
+
+    def isNull(self):
+        return not self.children and not self.points
+
+    def copy(self, *args):
+        shape = type(self).__new__(type(self))
+        shape.children, shape.points, shape.Placement = self.children, self.points, self.Placement
+        return shape
+
+    def located(self, placement):
+        shape = self.copy()
+        shape.Placement = placement
+        return shape
+
+    def scale(self, factor, base=None):
+        return self
+
+    def mirror(self, base, normal):
+        return self.copy()
+
+    def transformGeometry(self, matrix):
+        return self.copy()
+
+    def removeSplitter(self):
+        return self
+
+    def sewShape(self, *args):
+        pass
+
+    def reversed(self):
+        return self.copy()
+
+    def exportBrepToString(self):
+        return repr(len(self.allpoints()))
+
+    def importBrepFromString(self, brep):
+        pass
+
+    def exportBrep(self, filename):
+        with open(filename, "w") as f:
+            f.write(self.exportBrepToString())
+
+    def importBrep(self, filename):
+        pass
+
+
+class Edge(Shape):
+    def __init__(self, *args):
+        Shape.__init__(self, [a for a in args if isinstance(a, Shape)],
+                       [a for a in args if isinstance(a, Vector)])
+
+class Vertex(Shape):
+    def __init__(self, *args):
+        Shape.__init__(self, points=[Vector(*args)])
+
+class Wire(Shape):
+    pass
+
+class Face(Shape):
+    def __init__(self, wires, *args):
+        Shape.__init__(self, wires if isinstance(wires, list) else [wires])
+
+    def cutHoles(self, wires):
+        self.children.extend(wires)
+
+class Shell(Shape):
+    pass
+
+class Solid(Shape):
+    def __init__(self, shell):
+        Shape.__init__(self, [shell])
+
+class Compound(Shape):
+    pass
+
+
+def makeLine(start, end):
+    return Edge(Vector(start), Vector(end))
+
+def makePolygon(points):
+    return Wire(points=[Vector(p) for p in points])
+
+def makeShell(faces):
+    return Shell(faces)
+
+def makeSolid(shell):
+    return Solid(shell)
+
+def makeCompound(shapes):
+    return Compound(shapes)
+
+def makeCylinder(radius, height, *args):
+    return Solid(Shell(points=[Vector(-radius, -radius, 0), Vector(radius, radius, height)]))
+
+def makeSphere(radius, *args):
+    return Solid(Shell(points=[Vector(-radius, -radius, -radius), Vector(radius, radius, radius)]))
@@ -0,0 +1,48 @@
+import os, sys
+
+# The modules live at the top of the repository, like in the FreeCAD Mod folder
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+# Without FreeCAD the stand-ins of the benchmarks are used
+try:
+    import FreeCAD
+    stub = False
+except ImportError:
+    sys.path.insert(0, os.path.join(root, "benchmarks", "stubs"))
+    import FreeCAD
+    stub = True
+
+import numpy as np
+import pytest
+
+@pytest.fixture
+def doc():
+    doc = FreeCAD.newDocument("Test")
+    yield doc
+    FreeCAD.closeDocument(doc.Name)
+
+requiresfreecad = pytest.mark.skipif(stub, reason="needs OCC, the stand-ins do not model geometry")
+
+@pytest.fixture(autouse=True)
+def shapecache(tmp_path, monkeypatch):
+    # Every test starts with an empty shape cache of its own
+    import ShapeCache
+    cache = ShapeCache.ShapeCache(str(tmp_path / "shapes"))
+    monkeypatch.setattr(ShapeCache, "_cache", cache)
+    return cache
+
+def assertclosed(triangles):
+    # Every edge of a closed, consistently oriented mesh is used exactly
+    # once in each direction
+    start = triangles.ravel()
+    end = triangles[:, [1, 2, 0]].ravel()
+    count = start.max() + 1
+    forward = np.sort(start*count + end)
+    backward = np.sort(end*count + start)
+    assert len(np.unique(forward)) == len(forward)
+    assert np.array_equal(forward, backward)
+
+def signedvolume(vertices, triangles):
+    a, b, c = (vertices[triangles[:, i]] for i in range(3))
+    return np.einsum("ij,ij->", a, np.cross(b, c))/6
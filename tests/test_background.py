@@ -0,0 +1,105 @@
+"""
+Tests of the handling of background build results.
+"""
+import os, time
+import multiprocessing
+import pytest
+
+import FreeCAD
+import Part
+
+import Background
+import DecoratedObjects
+import PlatonicSolidObject
+import ShapeCache
+
+placement = FreeCAD.Placement(FreeCAD.Vector(10, 20, 30), FreeCAD.Rotation(0, 0, 0.6, 0.8))
+
+
+def sleeper(path):
+    # Stands in for a build running workers: records the pid of its worker
+    worker = multiprocessing.get_context("spawn").Process(target=time.sleep, args=(60,))
+    worker.start()
+    with open(path, "w") as f:
+        f.write(str(worker.pid))
+    worker.join()
+
+def talker():
+    # A build printing to the console, as FreeCAD does outside the GUI
+    os.write(2, b"Parallel build failed, building serially\n")
+    return Part.Shape()
+
+def alive(pid):
+    try:
+        with open("/proc/{0}/stat".format(pid)) as f:
+            return f.read().rsplit(")", 1)[1].split()[0] not in "ZX"
+    except FileNotFoundError:
+        return False
+
+def result(job):
+    for _ in range(600):
+        r = job.result()
+        if r is not None:
+            return r
+        time.sleep(0.05)
+
+def finished(doc, obj, module):
+    # Places obj, then lands a background build of its parameters
+    obj.Placement = placement
+    doc.recompute()
+    params = obj.Proxy.parameters(obj)
+    shape = module.buildshape(params, 1)
+    obj.Proxy.pending = params
+    Background.finish(obj, shape)
+    return params
+
+def test_finish_keeps_placement(doc):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    cyl.Segments = 12
+    for obj, module in ((cyl, DecoratedObjects),
+                        (PlatonicSolidObject.createPlatonicSolid(), PlatonicSolidObject)):
+        params = finished(doc, obj, module)
+        assert obj.LastUpdate == "background" and obj.Proxy.pending is None
+        for p in (obj.Placement, obj.Shape.Placement):
+            assert tuple(p.Base) == tuple(placement.Base) and p.Rotation.Q == placement.Rotation.Q
+        assert obj.Proxy.base[0] == params
+        assert ShapeCache.cache().get(ShapeCache.shapekey(obj.Proxy.Type, params)) is not None
+
+def test_busy(doc):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    params = cyl.Proxy.parameters(cyl)
+    assert not Background.busy(cyl, params)
+    # The job is gone, so the pending build is given up
+    cyl.Proxy.pending = params
+    assert not Background.busy(cyl, params)
+    assert cyl.Proxy.pending is None
+
+def test_addproperties(doc):
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    assert not solid.Background and solid.LastUpdate == "full"
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc to see the processes")
+def test_cancel_stops_workers(doc, tmp_path):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    path = tmp_path / "worker"
+    job = Background.Job(cyl, __name__, "sleeper", (str(path),), None)
+    for _ in range(600):
+        if path.exists() and path.read_text():
+            break
+        time.sleep(0.05)
+    # The job process may start workers
+    worker = int(path.read_text())
+    assert alive(worker)
+    job.cancel()
+    for _ in range(100):
+        if not alive(worker):
+            break
+        time.sleep(0.05)
+    assert not alive(worker) and not job.process.is_alive()
+
+def test_output(doc):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    job = Background.Job(cyl, __name__, "talker", (), None)
+    ok, data, output = result(job)
+    job.cancel()
+    assert ok and "building serially" in output
@@ -0,0 +1,58 @@
+"""
+Tests of the convex hull.
+"""
+import numpy as np
+import pytest
+
+import ConvexHull
+import PlatonicGeometry
+from conftest import assertclosed, signedvolume
+
+
+def assertconvex(points, triangles):
+    normals, offsets = ConvexHull.planes(points, triangles)
+    assert (points @ normals.T - offsets).max() < 1e-8
+
+def test_hull_cuboctahedron():
+    points = [p for p in np.array(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1])).reshape(3, -1).T
+              if np.count_nonzero(p) == 2]
+    vertices, faces = ConvexHull.polyhedron(np.array(points, dtype=float) + 0.1*np.random.default_rng(0).normal(size=3))
+    assert len(vertices) == 12
+    assert sorted(len(f) for f in faces) == [3]*8 + [4]*6
+
+@pytest.mark.parametrize("solid", ["Tetrahedron", "Cube", "Octahedron", "Dodecahedron", "Icosahedron"])
+def test_hull_platonic(solid):
+    t = PlatonicGeometry.topology[solid]
+    # With the centre and the edge midpoints, which are not corners
+    points = np.concatenate([t.vertices, [[0, 0, 0]], t.vertices[t.edges].mean(axis=1)])
+    vertices, faces = ConvexHull.polyhedron(points)
+    assert len(vertices) == len(t.vertices) and len(faces) == len(t.faces)
+
+def test_hull_sphere():
+    points = np.random.default_rng(1).normal(size=(2000, 3))
+    points /= np.linalg.norm(points, axis=1)[:, None]
+    triangles = ConvexHull.convexhull(points)
+    # Every point is a corner
+    assert len(np.unique(triangles)) == len(points) and len(triangles) == 2*len(points) - 4
+    assertclosed(triangles)
+    assertconvex(points, triangles)
+    assert signedvolume(points, triangles) > 0
+
+def test_hull_cloud():
+    points = np.random.default_rng(2).normal(size=(5000, 3))
+    triangles = ConvexHull.convexhull(points)
+    assertclosed(triangles)
+    assertconvex(points, triangles)
+
+def test_hull_grid():
+    # Many coplanar and collinear points
+    points = np.array(np.meshgrid(*[np.arange(4)]*3)).reshape(3, -1).T.astype(float)
+    vertices, faces = ConvexHull.polyhedron(points)
+    assert len(vertices) == 8 and sorted(len(f) for f in faces) == [4]*6
+
+@pytest.mark.parametrize("points", [[[0, 0, 0], [1, 1, 1], [2, 2, 2], [3, 3, 3]],
+                                    [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0], [2, 3, 0]],
+                                    [[0, 0, 0], [1, 0, 0], [0, 1, 0]]])
+def test_hull_degenerate(points):
+    with pytest.raises(ValueError):
+        ConvexHull.convexhull(points)
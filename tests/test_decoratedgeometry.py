@@ -0,0 +1,36 @@
+"""
+Tests of the decorated cylinder kernel; it needs no FreeCAD.
+"""
+import numpy as np
+import pytest
+
+import DecoratedGeometry
+from conftest import assertclosed, signedvolume
+
+
+@pytest.mark.parametrize("segments, stripes", [(3, 1), (7, 3), (36, 5), (180, 20)])
+@pytest.mark.parametrize("reversed", [False, True])
+def test_cylindermesh_closed(segments, stripes, reversed):
+    vertices, triangles = DecoratedGeometry.cylindermesh(20.0, 2.0, 50.0, segments, stripes, reversed)
+    assert len(vertices) == 2*segments*(stripes + 1)
+    assert len(triangles) == 4*segments*stripes + 4*segments
+    assertclosed(triangles)
+    if segments > 3:
+        # Three segments twisted by a third of a turn enclose nothing
+        assert signedvolume(vertices, triangles) > 0
+
+def test_layerpoints():
+    x, y = DecoratedGeometry.layerpoints(4, 2.0)
+    assert np.allclose(x, [0, 2, 0, -2, 0], atol=1e-12)
+    assert np.allclose(y, [2, 0, -2, 0, 2], atol=1e-12)
+
+@pytest.mark.parametrize("segments, stripes", [(7, 3), (36, 5), (720, 200)])
+@pytest.mark.parametrize("reversed", [False, True])
+def test_cylindermeasures(segments, stripes, reversed):
+    vertices, triangles = DecoratedGeometry.cylindermesh(5.0, 1.5, 10.0, segments, stripes, reversed)
+    volume, area, bounds = DecoratedGeometry.cylindermeasures(5.0, 1.5, 10.0, segments, stripes)
+
+    a, b, c = (vertices[triangles[:, i]] for i in range(3))
+    assert volume == pytest.approx(signedvolume(vertices, triangles), rel=1e-9)
+    assert area == pytest.approx(np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()/2, rel=1e-9)
+    assert bounds == pytest.approx(np.concatenate([vertices.min(axis=0), vertices.max(axis=0)]))
@@ -0,0 +1,91 @@
+"""
+Tests of the DecoratedCylinder feature.
+"""
+import numpy as np
+import pytest
+
+import DecoratedGeometry
+import DecoratedObjects
+from conftest import requiresfreecad
+
+
+def cylinder(doc):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    cyl.Segments = 12
+    doc.recompute()
+    return cyl
+
+def test_incremental_updates(doc):
+    cyl = cylinder(doc)
+    assert cyl.LastUpdate == "full"
+
+    # Every update starts from the last full build
+    cyl.Height = 20
+    doc.recompute()
+    assert cyl.LastUpdate == "z-scale"
+    cyl.Reversed = True
+    doc.recompute()
+    assert cyl.LastUpdate == "z-scale+mirror"
+    cyl.Height = 10
+    doc.recompute()
+    assert cyl.LastUpdate == "mirror"
+    cyl.Reversed = False
+    doc.recompute()
+    assert cyl.LastUpdate == "unchanged"
+
+def test_topology_changes(doc):
+    cyl = cylinder(doc)
+    cyl.Stripes = 7
+    doc.recompute()
+    assert cyl.LastUpdate == "full"
+    # Built before, so it comes from the cache
+    cyl.Stripes = 5
+    doc.recompute()
+    assert cyl.LastUpdate == "cache"
+
+def test_unobserved_changes(doc):
+    cyl = cylinder(doc)
+    # A height the proxy did not see change cannot be trusted for a scale
+    cyl.__dict__["Height"] = type(cyl.Height)(30)
+    cyl.touch()
+    doc.recompute()
+    assert cyl.LastUpdate == "full"
+
+def test_invalid_parameters(doc):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    assert cyl.Shape.isNull() and cyl.LastUpdate == ""
+
+@pytest.mark.parametrize("segments, stripes, count", [(12, 5, 2), (12, 5, 3), (8, 20, 7), (36, 2, 4)])
+def test_seams(segments, stripes, count):
+    # The cap triangles come after the walls and are always sewn
+    vertices, triangles = DecoratedGeometry.cylindermesh(10.0, 1.0, 10.0, segments, stripes)
+    bounds = np.linspace(0, 2*stripes, count + 1).round().astype(int)
+    seam = DecoratedObjects.seams(bounds, segments)
+    chunk = np.repeat(np.arange(count), np.diff(bounds)*2*segments)
+    caps = len(triangles) - len(seam)
+    seam = np.concatenate([seam, np.ones(caps, dtype=bool)])
+    chunk = np.concatenate([chunk, np.full(caps, -1)])
+
+    # Triangles meeting across a chunk boundary or at a cap are both sewn
+    edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    owner = np.repeat(np.arange(len(triangles)), 3)
+    order = np.lexsort(edges.T[::-1])
+    first, second = owner[order[0::2]], owner[order[1::2]]
+    assert np.array_equal(edges[order[0::2]], edges[order[1::2]])
+    across = chunk[first] != chunk[second]
+    assert seam[first[across]].all() and seam[second[across]].all()
+    # and no more rows than that
+    assert seam[:-caps].sum() <= 2*segments*(2*count + 2)
+
+@requiresfreecad
+def test_parallelshell(doc, monkeypatch):
+    monkeypatch.setattr(DecoratedObjects, "chunksize", 100)
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    cyl.Segments, cyl.Stripes = 24, 12
+    params = cyl.Proxy.parameters(cyl)
+    serial = DecoratedObjects.buildshape(params, 1)
+    parallel = DecoratedObjects.buildshape(params, 3)
+    assert len(parallel.Faces) == len(serial.Faces)
+    assert parallel.Shells[0].isClosed() and parallel.isValid()
+    assert parallel.Volume == pytest.approx(serial.Volume, rel=1e-9)
+
@@ -0,0 +1,43 @@
+"""
+Tests of the lattice node and strut deduplication.
+"""
+import numpy as np
+import pytest
+
+import LatticeGeometry
+import PlatonicGeometry
+
+
+@pytest.mark.parametrize("cell, nodes, struts", [("Cube", 27, 54), ("Octahedron", 36, 96)])
+def test_lattice_dedupe(cell, nodes, struts):
+    n, s = LatticeGeometry.lattice(cell, 10.0, (2, 2, 2))
+    assert (len(n), len(s)) == (nodes, struts)
+    assert len(np.unique(s, axis=0)) == len(s)
+    assert len(np.unique(np.round(n, 9), axis=0)) == len(n)
+
+@pytest.mark.parametrize("cell", LatticeGeometry.cells)
+def test_single_cell(cell):
+    # Nothing to share in one cell
+    t = PlatonicGeometry.topology[cell]
+    n, s = LatticeGeometry.lattice(cell, 10.0, (1, 1, 1))
+    assert (len(n), len(s)) == (len(t.vertices), len(t.edges))
+
+def test_strut_lengths():
+    nodes, struts = LatticeGeometry.lattice("Cube", 10.0, (3, 2, 1))
+    lengths = np.linalg.norm(nodes[struts[:, 1]] - nodes[struts[:, 0]], axis=1)
+    assert np.allclose(lengths, 10.0)
+    strutplacements, nodeplacements = LatticeGeometry.instances(nodes, struts)
+    assert list(strutplacements) == [10.0]
+    assert len(strutplacements[10.0]) == len(struts) and len(nodeplacements) == len(nodes)
+
+def test_off_grid():
+    with pytest.raises(ValueError):
+        LatticeGeometry.gridkeys(np.array([[0.3, 0, 0]]), 1.0, (3, 3, 3))
+
+def test_latticemesh_counts():
+    nodes, struts = LatticeGeometry.lattice("Cube", 10.0, (2, 1, 1))
+    vertices, triangles = LatticeGeometry.latticemesh(nodes, struts, 1.0, 8)
+    strut = PlatonicGeometry.strutmesh(1.0, 10.0, 8)
+    node = PlatonicGeometry.spheremesh(1.0, 8)
+    assert len(triangles) == len(struts)*len(strut[1]) + len(nodes)*len(node[1])
+    assert triangles.max() == len(vertices) - 1
@@ -0,0 +1,90 @@
+"""
+Tests of the parameter-only storage of the shapes.
+"""
+import FreeCAD
+import Mesh
+import Part
+
+import DecoratedObjects
+import LatticeObject
+import PlatonicSolidObject
+import LazyShape
+import ShapeCache
+
+placement = FreeCAD.Placement(FreeCAD.Vector(10, 20, 30), FreeCAD.Rotation(0, 0, 0.6, 0.8))
+
+
+def stored(doc, obj):
+    # Saved with StoreShape off and placed somewhere
+    obj.StoreShape = False
+    obj.Placement = placement
+    doc.recompute()
+    return obj
+
+def reopened(obj):
+    # What is left of obj after saving and opening the document again
+    empty = Mesh.Mesh() if LazyShape.output(obj) == "Mesh" else Part.Shape()
+    obj.__dict__[LazyShape.output(obj)] = empty
+    proxy = type(obj.Proxy).__new__(type(obj.Proxy))
+    proxy.__setstate__(obj.Proxy.__getstate__())
+    obj.__dict__["Proxy"] = proxy
+    proxy.onDocumentRestored(obj)
+    return obj
+
+def assertplaced(obj):
+    for p in (obj.Placement, getattr(obj, LazyShape.output(obj)).Placement):
+        assert tuple(p.Base) == tuple(placement.Base) and p.Rotation.Q == placement.Rotation.Q
+
+def test_transient(doc):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    assert cyl.StoreShape
+    cyl.StoreShape = False
+    assert cyl.status["Shape"] == "Transient"
+    cyl.StoreShape = True
+    assert cyl.status["Shape"] == "-Transient"
+
+def test_restored_from_cache(doc):
+    solid = stored(doc, PlatonicSolidObject.createPlatonicSolid())
+    reopened(solid)
+    assert solid.LastUpdate == "cache"
+    assertplaced(solid)
+
+def test_rebuilt(doc, shapecache):
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    cyl.Segments = 12
+    stored(doc, cyl)
+    shapecache.clear()
+    reopened(cyl)
+    assert cyl.LastUpdate == "restored"
+    assert not cyl.Shape.isNull()
+    assertplaced(cyl)
+
+def test_hidden_objects_wait(doc, shapecache):
+    solid = stored(doc, PlatonicSolidObject.createPlatonicSolid())
+    solid.Visibility = False
+    shapecache.clear()
+    reopened(solid)
+    assert solid.Shape.isNull()
+
+    shape = LazyShape.ensureshape(solid)
+    assert not shape.isNull() and solid.LastUpdate == "restored"
+    assertplaced(solid)
+    # Built once, then it is there
+    assert LazyShape.ensureshape(solid) is solid.Shape
+
+def test_mesh(doc):
+    lattice = LatticeObject.createLattice("Mesh")
+    lattice.CountX = lattice.CountY = lattice.CountZ = 2
+    stored(doc, lattice)
+    assertplaced(lattice)
+    count = lattice.Mesh.CountFacets
+
+    reopened(lattice)
+    assert lattice.Mesh.CountFacets == count
+    assertplaced(lattice)
+
+def test_cached_shapes_stay_unplaced(doc, shapecache):
+    solid = stored(doc, PlatonicSolidObject.createPlatonicSolid())
+    reopened(solid)
+    cached = shapecache.get(ShapeCache.shapekey(solid.Proxy.Type, solid.Proxy.parameters(solid)))
+    assert cached.Placement.isIdentity()
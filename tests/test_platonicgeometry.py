@@ -0,0 +1,101 @@
+"""
+Tests of the platonic solid kernel; it needs no FreeCAD.
+"""
+import numpy as np
+import pytest
+
+import PlatonicGeometry
+from conftest import assertclosed, signedvolume
+
+counts = [("Tetrahedron", 4, 6, 4), ("Cube", 8, 12, 6), ("Octahedron", 6, 12, 8),
+          ("Icosahedron", 12, 30, 20), ("Dodecahedron", 20, 30, 12)]
+
+
+@pytest.mark.parametrize("solid, vertices, edges, faces", counts)
+def test_topology(solid, vertices, edges, faces):
+    t = PlatonicGeometry.topology[solid]
+    assert (len(t.vertices), len(t.edges), len(t.faces)) == (vertices, edges, faces)
+    assert np.all(t.edges[:, 0] < t.edges[:, 1])
+    lengths = np.linalg.norm(t.vertices[t.edges[:, 1]] - t.vertices[t.edges[:, 0]], axis=1)
+    assert lengths == pytest.approx(t.edgelength)
+    assert np.linalg.norm(t.vertices, axis=1) == pytest.approx(t.radius)
+    assertclosed(t.triangles)
+    assert signedvolume(t.vertices, t.triangles) > 0
+
+@pytest.mark.parametrize("solid", [c[0] for c in counts])
+def test_adjacency(solid):
+    t = PlatonicGeometry.topology[solid]
+    degree = np.diff(t.adjacencyptr)
+    assert degree.sum() == 2*len(t.edges)
+    for i in range(len(t.vertices)):
+        for j in t.adjacency[t.adjacencyptr[i]:t.adjacencyptr[i+1]]:
+            assert [min(i, j), max(i, j)] in t.edges.tolist()
+
+def test_readonly():
+    t = PlatonicGeometry.topology["Cube"]
+    with pytest.raises(ValueError):
+        t.vertices[0, 0] = 5
+    with pytest.raises(TypeError):
+        PlatonicGeometry.topology["Cube"] = t
+    assert PlatonicGeometry.gettopology("Cube") is t
+    assert PlatonicGeometry.gettopology(t) is t
+
+@pytest.mark.parametrize("solid", ["Tetrahedron", "Cube", "Octahedron", "Icosahedron"])
+@pytest.mark.parametrize("frequency", [2, 3, 10])
+def test_geodesic(solid, frequency):
+    base = PlatonicGeometry.topology[solid]
+    t = PlatonicGeometry.geodesic(solid, frequency)
+    assert len(t.faces) == len(base.triangles)*frequency**2
+    assert len(t.vertices) - len(t.edges) + len(t.faces) == 2
+    assert np.linalg.norm(t.vertices, axis=1) == pytest.approx(base.radius)
+    assertclosed(t.triangles)
+    assert signedvolume(t.vertices, t.triangles) > signedvolume(base.vertices, base.triangles)
+
+def test_geodesic_frequency_one():
+    assert PlatonicGeometry.geodesic("Cube", 1) is PlatonicGeometry.topology["Cube"]
+
+def test_geodesic_cached():
+    assert PlatonicGeometry.geodesic("Icosahedron", 4) is PlatonicGeometry.geodesic("Icosahedron", 4)
+
+def test_geodesic_hull():
+    # Custom solids are subdivided the same way
+    base = PlatonicGeometry.hulltopology(PlatonicGeometry.topology["Cube"].vertices*2)
+    t = PlatonicGeometry.geodesic(base, 3)
+    assert len(t.faces) == len(base.triangles)*9
+    assertclosed(t.triangles)
+
+def test_solidmeasures():
+    volume, area, bounds = PlatonicGeometry.solidmeasures("Cube", 2.0)
+    assert (volume, area) == pytest.approx((64.0, 96.0))
+    assert bounds == pytest.approx((-2, -2, -2, 2, 2, 2))
+
+@pytest.mark.parametrize("solid", [c[0] for c in counts])
+def test_framemeasures_compound(solid):
+    t = PlatonicGeometry.topology[solid]
+    r, lengths = 0.5, len(t.edges)*t.edgelength
+    volume, area, bounds = PlatonicGeometry.framemeasures(solid, 1.0, r, fuse=False)
+    assert volume == pytest.approx(np.pi*r*r*lengths + len(t.vertices)*4*np.pi*r**3/3)
+    assert area == pytest.approx(2*np.pi*r*lengths + len(t.edges)*2*np.pi*r*r + len(t.vertices)*4*np.pi*r*r)
+    assert bounds == pytest.approx(np.concatenate([t.vertices.min(axis=0) - r, t.vertices.max(axis=0) + r]))
+
+def test_multioverlaps():
+    # Three struts at right angles overlap in an eighth of the tricylinder
+    # (Steinmetz solid), outside the eighth of the node
+    v, a = PlatonicGeometry.multioverlaps(np.eye(3)[None])
+    assert v[0] == pytest.approx(2 - np.sqrt(2) - np.pi/6, rel=1e-3)
+    # Covered by three struts in an eighth of the directions
+    assert a[0] == pytest.approx(3*v[0] + np.pi/2, rel=1e-2)
+    # Two struts are left to the pairs
+    v, a = PlatonicGeometry.multioverlaps(np.eye(3)[None, :2])
+    assert (v[0], a[0]) == (0, 0)
+
+@pytest.mark.parametrize("solid", [c[0] for c in counts])
+def test_framemeasures_fused(solid):
+    # The surface grows with the volume as the struts thicken
+    t = PlatonicGeometry.topology[solid]
+    r, h = 0.1*t.edgelength, 1e-4
+    volume, area, _ = PlatonicGeometry.framemeasures(solid, 1.0, r)
+    grown = PlatonicGeometry.framemeasures(solid, 1.0, r + h)[0]
+    shrunk = PlatonicGeometry.framemeasures(solid, 1.0, r - h)[0]
+    assert area == pytest.approx((grown - shrunk)/(2*h), rel=1e-3)
+    assert volume < PlatonicGeometry.framemeasures(solid, 1.0, r, fuse=False)[0]
@@ -0,0 +1,75 @@
+"""
+Tests of the PlatonicSolid feature.
+"""
+import PlatonicSolidObject
+
+
+def restored(obj, state):
+    # What FreeCAD does with the proxy of a saved object
+    proxy = PlatonicSolidObject.PlatonicSolid.__new__(PlatonicSolidObject.PlatonicSolid)
+    proxy.__setstate__(state)
+    obj.Proxy = proxy
+    proxy.onDocumentRestored(obj)
+    return proxy
+
+def test_old_documents_keep_their_frames(doc):
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    solid.SolidObject = True
+    proxy = restored(solid, { 'Type': 'platonicSolid' })
+    assert not solid.SolidObject
+    assert proxy.__getstate__()['Version'] == PlatonicSolidObject.stateversion
+
+def test_solid_objects_stay_solid(doc):
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    assert not solid.SolidObject
+    solid.SolidObject = True
+    restored(solid, solid.Proxy.__getstate__())
+    assert solid.SolidObject
+
+def frame(doc, **properties):
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    for name, value in properties.items():
+        setattr(solid, name, value)
+    doc.recompute()
+    return solid
+
+def test_scaled_frame(doc):
+    solid = frame(doc)
+    assert solid.LastUpdate == "full"
+    solid.OuterRadius, solid.EdgeRadius = 20, 4
+    doc.recompute()
+    assert solid.LastUpdate == "scale"
+    # Without the edge radius the struts would get thicker
+    solid.OuterRadius = 10
+    doc.recompute()
+    assert solid.LastUpdate == "full"
+    solid.touch()
+    doc.recompute()
+    assert solid.LastUpdate == "unchanged"
+
+def test_scaled_solid(doc):
+    solid = frame(doc, SolidObject=True)
+    solid.OuterRadius = 15
+    doc.recompute()
+    assert solid.LastUpdate == "scale"
+    # Solids have no struts
+    solid.OuterRadius, solid.EdgeRadius = 10, 1
+    doc.recompute()
+    assert solid.LastUpdate == "unchanged"
+
+def test_frequency_and_points(doc):
+    solid = frame(doc, Solid="Icosahedron", SolidObject=True)
+    solid.Frequency = 2
+    doc.recompute()
+    assert solid.LastUpdate == "full"
+    solid.Frequency = 1
+    doc.recompute()
+    assert solid.LastUpdate == "cache"
+
+    solid.Solid = "Custom"
+    solid.Points = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)]
+    doc.recompute()
+    assert solid.LastUpdate == "full"
+    solid.Points = solid.Points + [(1, 1, 1)]
+    doc.recompute()
+    assert solid.LastUpdate == "full"
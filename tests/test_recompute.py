@@ -0,0 +1,82 @@
+"""
+Tests of the coalesced recomputes.
+"""
+import FreeCAD
+import pytest
+
+import Recompute
+
+
+class Counter:
+    def __init__(self, obj):
+        self.executed = 0
+        obj.addProperty("App::PropertyInteger", "Value", "Test", "Any value")
+        obj.Proxy = self
+
+    def execute(self, obj):
+        self.executed += 1
+
+def feature(doc, name):
+    obj = doc.addObject("App::FeaturePython", name)
+    Counter(obj)
+    return obj
+
+def test_request_outside_batch(doc):
+    a = feature(doc, "a")
+    Recompute.request(a)
+    assert doc.recomputes == [["a"]]
+    assert a.Proxy.executed == 1
+
+def test_batch(doc):
+    a, b, c = feature(doc, "a"), feature(doc, "b"), feature(doc, "c")
+    with Recompute.batch("Edit", doc):
+        a.Value = 1
+        Recompute.request(a)
+        with Recompute.batch():
+            b.Value = 2
+            Recompute.request(b)
+            Recompute.request(a)
+        assert doc.recomputes == []
+    # One recompute for both, c is left alone
+    assert doc.recomputes == [["a", "b"]]
+    assert (a.Proxy.executed, b.Proxy.executed, c.Proxy.executed) == (1, 1, 0)
+
+def test_whole_document(doc):
+    a = feature(doc, "a")
+    with Recompute.batch():
+        Recompute.request(a)
+        Recompute.request(doc)
+        Recompute.request(a)
+    assert doc.recomputes == [None]
+
+def test_dependents(doc):
+    a, b, c = feature(doc, "a"), feature(doc, "b"), feature(doc, "c")
+    # c uses b, which uses a
+    a.__dict__["InList"] = [b]
+    b.__dict__["InList"] = [c]
+    Recompute.request(a)
+    assert doc.recomputes == [["a", "b", "c"]]
+
+def test_closed_and_deleted(doc):
+    a, b = feature(doc, "a"), feature(doc, "b")
+    other = FreeCAD.newDocument("Other")
+    with Recompute.batch():
+        Recompute.request(a)
+        Recompute.request(b)
+        Recompute.request(other)
+        doc.removeObject("b")
+        FreeCAD.closeDocument(other.Name)
+    assert doc.recomputes == [["a"]]
+    assert other.recomputes == []
+
+def test_failed_batch(doc):
+    a = feature(doc, "a")
+    with pytest.raises(RuntimeError):
+        with Recompute.batch():
+            Recompute.request(a)
+            raise RuntimeError("edit failed")
+    # Requests made before the failure wait for the next recompute
+    assert Recompute._depth == 0
+    assert doc.recomputes == []
+    Recompute.flush()
+    assert doc.recomputes == [["a"]]
@@ -0,0 +1,76 @@
+"""
+Tests of the shape cache: the LRU in memory and the BREP files on disk.
+"""
+import os
+
+import Part
+import ShapeCache
+
+
+def test_lru_items():
+    lru = ShapeCache.LRUCache(2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1
+    lru.put("c", 3)
+    # b was used least recently
+    assert "b" not in lru and lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.get("b", 0) == 0
+
+def test_lru_size():
+    lru = ShapeCache.LRUCache(10, sizeof=len)
+    lru.put("a", "xxxx")
+    lru.put("b", "yyyy")
+    lru.put("a", "xx")
+    assert lru.total == 6
+    lru.put("c", "zzzzzz")
+    assert list(lru.entries) == ["a", "c"] and lru.total == 8
+    # A single entry larger than the limit is still kept
+    lru.put("d", "w"*20)
+    assert list(lru.entries) == ["d"] and lru.total == 20
+    lru.discard("d")
+    assert len(lru) == 0 and lru.total == 0
+
+def test_shapekey():
+    a = ShapeCache.shapekey("kind", { 'Radius': 1.0, 'Segments': 12 })
+    assert a == ShapeCache.shapekey("kind", { 'Segments': 12, 'Radius': 1.0 })
+    assert a != ShapeCache.shapekey("other", { 'Radius': 1.0, 'Segments': 12 })
+    assert a != ShapeCache.shapekey("kind", { 'Radius': 2.0, 'Segments': 12 })
+
+def test_memory_and_disk(tmp_path):
+    cache = ShapeCache.ShapeCache(str(tmp_path), memoryitems=1)
+    first, second = Part.makeSphere(1.0), Part.makeSphere(2.0)
+    cache.put("first", first)
+    cache.put("second", second)
+    assert cache.get("second") is second
+    assert os.path.exists(cache.filename("first"))
+
+    # Gone from memory, read back from its file
+    shape = cache.get("first")
+    assert shape is not None and shape is not first
+    assert cache.get("first") is shape
+    assert cache.get("missing") is None
+
+    cache.clear()
+    assert cache.get("first") is None and not os.listdir(str(tmp_path))
+
+def test_disk_eviction(tmp_path):
+    cache = ShapeCache.ShapeCache(str(tmp_path), memoryitems=1, disksize=0)
+    cache.put("memory", Part.makeSphere(1.0))
+    assert not os.path.exists(str(tmp_path / "memory.brep"))
+
+    shape = Part.makeSphere(1.0)
+    size = len(shape.exportBrepToString())
+    cache = ShapeCache.ShapeCache(str(tmp_path), memoryitems=1, disksize=2*size)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, shape)
+        os.utime(cache.filename(key), (1000 + i, 1000 + i))
+        cache.evict()
+    # The oldest file goes first
+    assert sorted(os.listdir(str(tmp_path))) == ["b.brep", "c.brep"]
+
+    # Reading a file makes it the newest
+    cache.memory.clear()
+    cache.get("b")
+    cache.put("d", shape)
+    assert sorted(os.listdir(str(tmp_path))) == ["b.brep", "d.brep"]
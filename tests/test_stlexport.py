@@ -0,0 +1,99 @@
+"""
+Tests of the STL export of the features.
+"""
+import math, os
+
+import FreeCAD
+import pytest
+
+import DecoratedGeometry
+import DecoratedObjects
+import PlatonicSolidObject
+import STLExport
+
+
+def saved(doc, tmp_path):
+    doc.FileName = str(tmp_path / "{0}.FCStd".format(doc.Name))
+    return doc
+
+def test_invalid_parameters_are_not_exported(doc, tmp_path):
+    saved(doc, tmp_path)
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    assert cyl.Segments == 0
+    assert not STLExport.exportable(cyl)
+    cyl.Segments, cyl.Stripes = 12, 0
+    assert not STLExport.exportable(cyl)
+
+    assert STLExport.exportObjects([cyl], workers=1) == []
+    assert not os.path.exists(STLExport.filename(cyl))
+
+def test_direct_export(doc, tmp_path):
+    saved(doc, tmp_path)
+    cyl = DecoratedObjects.createDecoratedCylinder()
+    cyl.Segments = 12
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    solid.SolidObject = True
+    solid.Solid = "Icosahedron"
+    doc.recompute()
+
+    results = STLExport.exportObjects([cyl, solid], workers=1)
+    assert sorted((label, mode, facets) for label, _, mode, facets, _ in results) == \
+        [(cyl.Label, "direct", 4*12*5 + 4*12), (solid.Label, "direct", 20)]
+    for obj in (cyl, solid):
+        assert os.path.getsize(STLExport.filename(obj)) == 84 + 50*(20 if obj is solid else 288)
+
+def test_custom_solid_without_hull(doc):
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    solid.SolidObject = True
+    solid.Solid = "Custom"
+    solid.Points = [(0, 0, 0), (1, 0, 0), (0, 1, 0)]
+    assert not STLExport.exportable(solid)
+    solid.Points = solid.Points + [(0, 0, 1)]
+    assert STLExport.exportable(solid)
+
+def test_deflection(doc):
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    linear, angular = STLExport.deflection(solid)
+    # Small objects keep the fixed 0.1 mm
+    assert linear == pytest.approx(0.1)
+    assert angular == pytest.approx(math.radians(3))
+
+    solid.OuterRadius = 1000
+    solid.EdgeRadius = 10
+    doc.recompute()
+    assert STLExport.deflection(solid)[0] == pytest.approx(STLExport.size(solid)*0.001)
+    assert STLExport.deflection(solid)[0] > 2
+
+    solid.LinearDeflection = 0.05
+    solid.AngularDeflection = 10
+    assert STLExport.deflection(solid) == pytest.approx((0.05, math.radians(10)))
+
+def test_unchanged_features_are_not_rebuilt(doc, tmp_path, monkeypatch):
+    saved(doc, tmp_path)
+    solid = PlatonicSolidObject.createPlatonicSolid()
+    doc.recompute()
+    [(_, name, mode, facets, _)] = STLExport.exportObjects([solid], workers=1)
+    assert mode != "unchanged" and os.path.exists(name)
+
+    def rebuild(obj):
+        raise AssertionError("shape rebuilt for an unchanged object")
+    monkeypatch.setattr(STLExport.LazyShape, "ensureshape", rebuild)
+    assert STLExport.exportObjects([solid], workers=1)[0][2] == "unchanged"
+
+    # A new placement or new parameters are exported again
+    monkeypatch.undo()
+    solid.Placement = FreeCAD.Placement(FreeCAD.Vector(5, 0, 0), FreeCAD.Rotation())
+    assert STLExport.exportObjects([solid], workers=1)[0][2] != "unchanged"
+    assert STLExport.exportObjects([solid], workers=1)[0][2] == "unchanged"
+    solid.EdgeRadius = 1
+    doc.recompute()
+    assert STLExport.exportObjects([solid], workers=1)[0][2] != "unchanged"
+    assert STLExport.exportObjects([solid], workers=1, force=True)[0][2] != "unchanged"
+
+def test_unchanged_geometry(tmp_path):
+    vertices, triangles = DecoratedGeometry.cylindermesh(20.0, 2.0, 50.0, 12, 2)
+    name = str(tmp_path / "cylinder.stl")
+    assert STLExport.writefile(name, (vertices, triangles), None, 0.1, 0.05)[0] == len(triangles)
+    assert STLExport.writefile(name, (vertices, triangles), None, 0.1, 0.05) is None
+    vertices = vertices*2
+    assert STLExport.writefile(name, (vertices, triangles), None, 0.1, 0.05) is not None
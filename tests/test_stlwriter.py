@@ -0,0 +1,51 @@
+"""
+Tests of the binary STL writer; it needs no FreeCAD.
+"""
+import numpy as np
+import pytest
+
+import STLWriter
+import DecoratedGeometry
+
+
+def readstl(filename):
+    with open(filename, "rb") as f:
+        data = f.read()
+    count = int(np.frombuffer(data[80:84], dtype="<u4")[0])
+    return count, np.frombuffer(data[84:], dtype=STLWriter.facetdtype)
+
+def test_writestl(tmp_path):
+    vertices, triangles = DecoratedGeometry.cylindermesh(20.0, 2.0, 50.0, 36, 5)
+    name = str(tmp_path / "cylinder.stl")
+    STLWriter.writeStl(name, vertices, triangles)
+
+    count, facets = readstl(name)
+    assert count == len(facets) == len(triangles)
+    assert facets['vertices'] == pytest.approx(vertices[triangles].astype(np.float32))
+    assert np.linalg.norm(facets['normal'], axis=1) == pytest.approx(1, rel=1e-6)
+
+def test_writestl_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(STLWriter, "chunksize", 7)
+    vertices, triangles = DecoratedGeometry.cylindermesh(20.0, 2.0, 50.0, 12, 3)
+    name = str(tmp_path / "chunks.stl")
+    STLWriter.writeStl(name, vertices, triangles)
+
+    _, facets = readstl(name)
+    assert facets['vertices'] == pytest.approx(vertices[triangles].astype(np.float32))
+
+def test_degenerate_and_empty(tmp_path):
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0]], dtype=float)
+    name = str(tmp_path / "degenerate.stl")
+    STLWriter.writeStl(name, vertices, [[0, 1, 2], [0, 1, 3]])
+    _, facets = readstl(name)
+    assert facets['normal'].tolist() == [[0, 0, 0], [0, 0, 1]]
+
+    STLWriter.writeStl(name, vertices, np.empty((0, 3), dtype=int))
+    assert readstl(name)[0] == 0
+
+def test_transform():
+    matrix = [0, -1, 0, 10,
+              1, 0, 0, 0,
+              0, 0, 1, 5,
+              0, 0, 0, 1]
+    assert STLWriter.transform(np.array([[1.0, 2.0, 3.0]]), matrix).tolist() == [[8.0, 1.0, 8.0]]
@@ -0,0 +1,60 @@
+"""
+Tests of the 3MF writer.
+"""
+import zipfile
+import xml.etree.ElementTree as ET
+import numpy as np
+
+import ThreeMFWriter
+
+ns = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+
+vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+triangles = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+
+
+def model(path):
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        assert {"[Content_Types].xml", "_rels/.rels", "3D/3dmodel.model"} <= names
+        return ET.fromstring(archive.read("3D/3dmodel.model"))
+
+def test_mesh(tmp_path):
+    path = tmp_path / "mesh.3mf"
+    with ThreeMFWriter.Package(str(path)) as package:
+        id = package.mesh(vertices, triangles, name="tetra")
+        package.item(id)
+    root = model(path)
+    obj = root.find("m:resources/m:object", ns)
+    assert obj.get("name") == "tetra"
+    points = [[float(v.get(a)) for a in "xyz"] for v in obj.findall("m:mesh/m:vertices/m:vertex", ns)]
+    faces = [[int(t.get(a)) for a in ("v1", "v2", "v3")] for t in obj.findall("m:mesh/m:triangles/m:triangle", ns)]
+    assert np.allclose(points, vertices) and faces == triangles.tolist()
+    assert [i.get("objectid") for i in root.findall("m:build/m:item", ns)] == [str(id)]
+    assert package.triangles == 4
+
+def test_components(tmp_path):
+    path = tmp_path / "components.3mf"
+    shift = np.eye(4)
+    shift[:3, 3] = (5, 6, 7)
+    with ThreeMFWriter.Package(str(path)) as package:
+        strut = package.mesh(vertices, triangles, key="strut")
+        # Written once per key
+        assert package.mesh(vertices, triangles, key="strut") == strut
+        assert package.resource("strut") == strut
+        frame = package.components([(strut, None), (strut, shift)])
+        package.item(frame, shift)
+    root = model(path)
+    assert len(root.findall("m:resources/m:object/m:mesh", ns)) == 1
+    components = root.findall("m:resources/m:object/m:components/m:component", ns)
+    assert [c.get("objectid") for c in components] == [str(strut)] * 2
+    assert components[0].get("transform") is None
+    # Row vectors: the translation comes last
+    assert components[1].get("transform") == "1 0 0 0 1 0 0 0 1 5 6 7"
+    assert root.find("m:build/m:item", ns).get("transform") == "1 0 0 0 1 0 0 0 1 5 6 7"
+
+def test_transform():
+    m = np.array([[0, -1, 0, 1], [1, 0, 0, 2], [0, 0, 1, 3], [0, 0, 0, 1]], dtype=float)
+    assert ThreeMFWriter.transform(m) == "0 1 0 -1 0 0 0 0 1 1 2 3"
+    assert ThreeMFWriter.isidentity(None) and ThreeMFWriter.isidentity(np.eye(4))
+    assert not ThreeMFWriter.isidentity(m)
@@ -0,0 +1,68 @@
+"""
+Tests of the shared process pool.
+"""
+import os
+import threading
+
+import pytest
+
+import WorkerPool
+
+
+def square(x):
+    return x*x
+
+def fail(x):
+    raise ValueError(x)
+
+def crash(x):
+    os._exit(1)
+
+@pytest.fixture(autouse=True)
+def pools(monkeypatch):
+    monkeypatch.setattr(WorkerPool, "_pools", {})
+    monkeypatch.setattr(WorkerPool, "_failed", False)
+    yield
+    WorkerPool.shutdown()
+
+def test_parallelmap():
+    assert WorkerPool.parallelmap(square, range(5), 2) == [0, 1, 4, 9, 16]
+
+def test_task_errors_keep_the_pool():
+    executor = WorkerPool.pool(2)
+    with pytest.raises(ValueError):
+        WorkerPool.parallelmap(fail, [1], 2)
+    assert WorkerPool.pool(2) is executor
+    assert WorkerPool.parallelmap(square, [3], 2) == [9]
+    assert WorkerPool.workercount(2) == 2
+
+def test_broken_pool():
+    executor = WorkerPool.pool(2)
+    with pytest.raises(WorkerPool.BrokenProcessPool):
+        WorkerPool.parallelmap(crash, [1], 2)
+    assert WorkerPool.pool(2) is not executor
+    assert WorkerPool.workercount(2) == 1
+
+def test_no_interpreter(monkeypatch):
+    monkeypatch.setattr(WorkerPool, "interpreter", lambda: None)
+    with pytest.raises(OSError):
+        WorkerPool.parallelmap(square, [1], 2)
+    assert WorkerPool.workercount(0) == 1
+
+def test_one_pool_for_all_threads(monkeypatch):
+    created = []
+    original = WorkerPool.ProcessPoolExecutor
+    def executor(*args, **kwargs):
+        created.append(1)
+        return original(*args, **kwargs)
+    monkeypatch.setattr(WorkerPool, "ProcessPoolExecutor", executor)
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(WorkerPool.parallelmap(square, [i], 2)))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results) == [[i*i] for i in range(8)]
+    assert len(created) == 1